@@ -4,6 +4,8 @@ from pydantic import BaseModel
 from typing import List, AsyncGenerator, Optional
 import logging
 
+import orjson
+
 from app.services.chat_service import chat_service
 from app.repository.conversation_repository import (
     create_conversation,
@@ -59,7 +61,7 @@ async def chat_stream(request: ChatRequest):
     # 2. Stream assistant response while buffering it so we can persist it
     # -------------------------------------------------------------------
 
-    async def event_stream() -> AsyncGenerator[str, None]:
+    async def event_stream() -> AsyncGenerator[bytes, None]:
         assistant_accum = ""
 
         # Optionally augment messages with RAG context from knowledgebase
@@ -85,11 +87,8 @@ async def chat_stream(request: ChatRequest):
             # here for performance. The payload looks like::
             #   data: {"delta": "text"}
             try:
-                import json as _json
-
-                if chunk.startswith("data:"):
-                    data_str = chunk.partition(":")[2].strip()
-                    data_json = _json.loads(data_str)
+                if chunk.startswith(b"data:"):
+                    data_json = orjson.loads(chunk.partition(b":")[2])
                     assistant_accum += data_json.get("delta", "")
             except Exception:  # noqa: BLE001
                 pass
@@ -108,6 +107,8 @@ async def chat_stream(request: ChatRequest):
 
     headers = {
         "Cache-Control": "no-cache",
+        # Ask reverse proxies (e.g. Nginx) not to buffer the event stream
+        "X-Accel-Buffering": "no",
         "Connection": "keep-alive",
         "Content-Encoding": "none",
         "Content-Type": "text/event-stream",
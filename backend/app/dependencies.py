@@ -1,5 +1,6 @@
 import os
 import asyncio
+import logging
 from functools import lru_cache
 from typing import Optional
 
@@ -12,6 +13,12 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Dimensionality of knowledgebase embeddings (OpenAI ``text-embedding-3-large``).
+# Used to size the optional pgvector columns and ANN indexes.
+KB_EMBEDDING_DIMENSIONS = 3072
+
 
 @lru_cache()
 def get_4o_llm():
@@ -376,6 +383,12 @@ async def setup_db_schema() -> None:
                 "CREATE UNIQUE INDEX IF NOT EXISTS uq_kb_documents_file_hash ON kb_documents(file_hash) WHERE file_hash IS NOT NULL"
             )
 
+            # Compact unit-normalized float16 copy of chunk embeddings for the
+            # in-process similarity scan (JSONB stays the source of truth)
+            await conn.execute(
+                "ALTER TABLE kb_chunks ADD COLUMN IF NOT EXISTS embedding_f16 BYTEA"
+            )
+
             # Activity log for knowledgebase operations (uploads, deletes, processing, etc.)
             await conn.execute(
                 """
@@ -397,4 +410,48 @@ async def setup_db_schema() -> None:
 
             await conn.execute(
                 "CREATE INDEX IF NOT EXISTS idx_kb_activity_timestamp ON kb_activity(timestamp)"
-            )
\ No newline at end of file
+            )
+
+    # -----------------------------------------------------------------
+    # Knowledgebase: optional pgvector ANN search
+    # -----------------------------------------------------------------
+    # Runs in its own transaction so a Postgres image without the pgvector
+    # extension leaves the core schema intact; retrieval then falls back to
+    # scanning the JSONB embeddings in Python. ``halfvec`` is used because
+    # HNSW on plain ``vector`` is limited to 2000 dimensions.
+    try:
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute("CREATE EXTENSION IF NOT EXISTS vector")
+                await conn.execute(
+                    f"ALTER TABLE kb_documents ADD COLUMN IF NOT EXISTS doc_embedding_vec halfvec({KB_EMBEDDING_DIMENSIONS})"
+                )
+                await conn.execute(
+                    f"ALTER TABLE kb_chunks ADD COLUMN IF NOT EXISTS embedding_vec halfvec({KB_EMBEDDING_DIMENSIONS})"
+                )
+                # Backfill rows embedded before the extension was available
+                await conn.execute(
+                    f"""
+                    UPDATE kb_documents
+                    SET doc_embedding_vec = doc_embedding::text::halfvec({KB_EMBEDDING_DIMENSIONS})
+                    WHERE doc_embedding_vec IS NULL AND doc_embedding IS NOT NULL
+                      AND embedding_dimensions = {KB_EMBEDDING_DIMENSIONS}
+                    """
+                )
+                await conn.execute(
+                    f"""
+                    UPDATE kb_chunks
+                    SET embedding_vec = embedding::text::halfvec({KB_EMBEDDING_DIMENSIONS})
+                    WHERE embedding_vec IS NULL AND embedding_dimensions = {KB_EMBEDDING_DIMENSIONS}
+                    """
+                )
+                await conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_kb_documents_embedding_hnsw "
+                    "ON kb_documents USING hnsw (doc_embedding_vec halfvec_cosine_ops)"
+                )
+                await conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_kb_chunks_embedding_hnsw "
+                    "ON kb_chunks USING hnsw (embedding_vec halfvec_cosine_ops)"
+                )
+    except Exception as exc:  # noqa: BLE001
+        logger.info("pgvector unavailable, using in-process similarity search: %s", exc)
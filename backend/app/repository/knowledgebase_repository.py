@@ -1,14 +1,47 @@
 from __future__ import annotations
 
 from typing import Any, Dict, List, Optional, Tuple
+import struct
 import uuid
 
 import asyncpg
 
-from app.dependencies import get_db_pool
+from app.dependencies import KB_EMBEDDING_DIMENSIONS, get_db_pool
 import json as _json
 
 
+def _pack_f16(embedding: List[float]) -> bytes:
+    """Pack an embedding as little-endian IEEE half floats."""
+    return struct.pack(f"<{len(embedding)}e", *embedding)
+
+
+def _unpack_f16(buf: bytes) -> List[float]:
+    return list(struct.unpack(f"<{len(buf) // 2}e", buf))
+
+
+# Cached result of probing for the pgvector columns (see ``setup_db_schema``)
+_VECTOR_SEARCH: Optional[bool] = None
+
+
+async def vector_search_available() -> bool:
+    """Return True when the pgvector ``halfvec`` columns and indexes exist."""
+    global _VECTOR_SEARCH  # noqa: PLW0603
+    if _VECTOR_SEARCH is None:
+        pool = await get_db_pool()
+        async with pool.acquire() as conn:
+            _VECTOR_SEARCH = bool(
+                await conn.fetchval(
+                    """
+                    SELECT EXISTS (
+                        SELECT 1 FROM information_schema.columns
+                        WHERE table_name = 'kb_chunks' AND column_name = 'embedding_vec'
+                    )
+                    """
+                )
+            )
+    return _VECTOR_SEARCH
+
+
 async def create_document(
     *,
     filename: str,
@@ -76,6 +109,15 @@ async def update_document_embedding(
             model,
             dimensions,
         )
+        if dimensions == KB_EMBEDDING_DIMENSIONS and await vector_search_available():
+            await conn.execute(
+                f"""
+                UPDATE kb_documents
+                SET doc_embedding_vec = doc_embedding::text::halfvec({KB_EMBEDDING_DIMENSIONS})
+                WHERE id = $1
+                """,
+                document_id,
+            )
 
 
 async def insert_chunk_embeddings(
@@ -94,6 +136,7 @@ async def insert_chunk_embeddings(
                 chunk_index,
                 text,
                 _json.dumps(embedding),
+                _pack_f16(embedding),
                 model,
                 dimensions,
             )
@@ -102,11 +145,20 @@ async def insert_chunk_embeddings(
         await conn.executemany(
             """
             INSERT INTO kb_chunks (
-                id, document_id, chunk_index, text, embedding, embedding_model, embedding_dimensions
-            ) VALUES ($1, $2, $3, $4, $5::jsonb, $6, $7)
+                id, document_id, chunk_index, text, embedding, embedding_f16, embedding_model, embedding_dimensions
+            ) VALUES ($1, $2, $3, $4, $5::jsonb, $6, $7, $8)
             """,
             records,
         )
+        if dimensions == KB_EMBEDDING_DIMENSIONS and await vector_search_available():
+            await conn.execute(
+                f"""
+                UPDATE kb_chunks
+                SET embedding_vec = embedding::text::halfvec({KB_EMBEDDING_DIMENSIONS})
+                WHERE document_id = $1 AND embedding_vec IS NULL
+                """,
+                document_id,
+            )
 
 
 async def list_documents(*, q: Optional[str] = None, is_global: Optional[bool] = None) -> List[Dict[str, Any]]:
@@ -207,7 +259,9 @@ async def list_chunks_for_documents(document_ids: List[str]) -> List[Dict[str, A
     async with pool.acquire() as conn:
         rows = await conn.fetch(
             """
-            SELECT id, document_id, chunk_index, text, embedding, embedding_model, embedding_dimensions
+            SELECT id, document_id, chunk_index, text,
+                   CASE WHEN embedding_f16 IS NULL THEN embedding END AS embedding,
+                   embedding_f16, embedding_model, embedding_dimensions
             FROM kb_chunks
             WHERE document_id = ANY($1::uuid[])
             ORDER BY document_id, chunk_index ASC
@@ -217,6 +271,12 @@ async def list_chunks_for_documents(document_ids: List[str]) -> List[Dict[str, A
         out: List[Dict[str, Any]] = []
         for r in rows:
             d = dict(r)
+            # Prefer the float16 copy: a quarter of the bytes and no JSON parse
+            f16 = d.pop("embedding_f16", None)
+            if f16 is not None:
+                d["embedding"] = _unpack_f16(f16)
+                out.append(d)
+                continue
             emb = d.get("embedding")
             if isinstance(emb, str):
                 try:
@@ -227,6 +287,64 @@ async def list_chunks_for_documents(document_ids: List[str]) -> List[Dict[str, A
         return out
 
 
+async def search_documents_by_embedding(embedding: List[float], *, limit: int) -> List[Dict[str, Any]]:
+    """Return the ``limit`` nearest documents by cosine similarity via the HNSW index.
+
+    Each row carries a ``score`` in the same ``1 - cosine distance`` scale as
+    ``_cosine_similarity`` in the service layer.
+    """
+    pool = await get_db_pool()
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(
+            f"""
+            SELECT id, filename, coalesce(title,'') AS title,
+                   1 - (doc_embedding_vec <=> $1::text::halfvec({KB_EMBEDDING_DIMENSIONS})) AS score
+            FROM kb_documents
+            WHERE doc_embedding_vec IS NOT NULL
+            ORDER BY doc_embedding_vec <=> $1::text::halfvec({KB_EMBEDDING_DIMENSIONS})
+            LIMIT $2
+            """,
+            _json.dumps(embedding),
+            limit,
+        )
+        return [dict(r) for r in rows]
+
+
+async def search_chunks_by_embedding(
+    embedding: List[float], *, document_ids: List[str], limit: int
+) -> List[Dict[str, Any]]:
+    """Return the ``limit`` nearest chunks of ``document_ids``, ranked exactly.
+
+    The candidate documents are few, so their chunks are fetched through the
+    ``document_id`` index and scored exhaustively. An HNSW scan would filter
+    by document only after the index search and can miss them entirely.
+    """
+    if not document_ids:
+        return []
+    pool = await get_db_pool()
+    async with pool.acquire() as conn:
+        # MATERIALIZED keeps the planner from ordering the outer query via HNSW
+        rows = await conn.fetch(
+            f"""
+            WITH candidates AS MATERIALIZED (
+                SELECT id, document_id, chunk_index, text, embedding_model, embedding_dimensions,
+                       embedding_vec
+                FROM kb_chunks
+                WHERE document_id = ANY($2::uuid[]) AND embedding_vec IS NOT NULL
+            )
+            SELECT id, document_id, chunk_index, text, embedding_model, embedding_dimensions,
+                   1 - (embedding_vec <=> $1::text::halfvec({KB_EMBEDDING_DIMENSIONS})) AS score
+            FROM candidates
+            ORDER BY embedding_vec <=> $1::text::halfvec({KB_EMBEDDING_DIMENSIONS})
+            LIMIT $3
+            """,
+            _json.dumps(embedding),
+            document_ids,
+            limit,
+        )
+        return [dict(r) for r in rows]
+
+
 async def update_document_description(document_id: str, description: str) -> None:
     pool = await get_db_pool()
     async with pool.acquire() as conn:
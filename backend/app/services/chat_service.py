@@ -7,10 +7,9 @@ end-points can remain thin, declarative, and easily testable.
 """
 
 from typing import AsyncGenerator, Dict, List
-import asyncio
-import json
 import logging
 import httpx
+import orjson
 from app.dependencies import _get_openai_client, _get_ollama_base_url
 
 
@@ -19,6 +18,20 @@ logger = logging.getLogger(__name__)
 # Public symbol exports
 __all__ = ["chat_service"]
 
+# Pre-encoded SSE framing; each event is assembled from bytes so the hot loop
+# does no string formatting or UTF-8 re-encoding per token.
+DATA_PREFIX = b"data: "
+ERROR_PREFIX = b"event: error\ndata: "
+EVENT_SUFFIX = b"\n\n"
+
+
+def _sse_data(data: object) -> bytes:
+    return DATA_PREFIX + orjson.dumps(data) + EVENT_SUFFIX
+
+
+def _sse_error(message: str) -> bytes:
+    return ERROR_PREFIX + orjson.dumps({"error": message}) + EVENT_SUFFIX
+
 
 # ---------------------------------------------------------------------------
 # Public service-layer API
@@ -30,7 +43,7 @@ async def chat_service(
     model: str,
     messages: List[Dict[str, str]],
     provider: str = "openai",
-) -> AsyncGenerator[str, None]:
+) -> AsyncGenerator[bytes, None]:
     """Yield Server-Sent Event (SSE) formatted chunks from an AI provider.
 
     Parameters
@@ -42,8 +55,8 @@ async def chat_service(
 
     Yields
     ------
-    str
-        Pre-formatted SSE ``data: ...`` strings ready to be returned by
+    bytes
+        Pre-encoded SSE ``data: ...`` events ready to be returned by
         ``fastapi.responses.StreamingResponse``.
     """
 
@@ -64,15 +77,14 @@ async def chat_service(
         async for chunk in response:
             logger.debug("Service received chunk: %s", chunk)
             data: Dict[str, object] = chunk.model_dump(exclude_none=True)
-            await asyncio.sleep(0)
-            yield f"data: {json.dumps(data)}\n\n"
+            yield _sse_data(data)
 
     except Exception as exc:  # noqa: BLE001
         logger.error("Streaming error: %s", exc)
-        yield f"event: error\ndata: {json.dumps({'error': str(exc)})}\n\n"
+        yield _sse_error(str(exc))
 
 
-async def _stream_from_ollama(*, model: str, messages: List[Dict[str, str]]) -> AsyncGenerator[str, None]:
+async def _stream_from_ollama(*, model: str, messages: List[Dict[str, str]]) -> AsyncGenerator[bytes, None]:
     """Stream chat completions from an Ollama server and emit SSE-formatted chunks.
 
     This uses Ollama's native REST API `/api/chat` with streaming enabled and
@@ -94,18 +106,18 @@ async def _stream_from_ollama(*, model: str, messages: List[Dict[str, str]]) ->
                     if not line:
                         continue
                     try:
-                        obj = json.loads(line)
-                    except json.JSONDecodeError:
+                        obj = orjson.loads(line)
+                    except orjson.JSONDecodeError:
                         # Some Ollama versions may send partial lines; skip until valid
                         continue
 
                     # Incremental assistant content
                     delta = obj.get("message", {}).get("content") or ""
                     if delta:
-                        yield f"data: {json.dumps({'delta': delta})}\n\n"
+                        yield _sse_data({"delta": delta})
 
                     # Stop when the stream signals completion
                     if obj.get("done") is True:
                         break
         except httpx.HTTPError as http_err:
-            yield f"event: error\ndata: {json.dumps({'error': str(http_err)})}\n\n"
+            yield _sse_error(str(http_err))
@@ -2,16 +2,21 @@ from __future__ import annotations
 
 from typing import Dict, List, Optional, Tuple
 import os
-import io
+import asyncio
+import heapq
+import logging
 import math
 import mimetypes
+from functools import lru_cache
 
 from openai import AsyncOpenAI
 
-from app.dependencies import _get_openai_client
+from app.dependencies import KB_EMBEDDING_DIMENSIONS, _get_openai_client
 from app.repository import knowledgebase_repository as repo
 
 
+logger = logging.getLogger(__name__)
+
 EMBEDDING_MODEL = "text-embedding-3-large"
 
 
@@ -32,7 +37,23 @@ def _split_text(text: str, *, chunk_size: int = 1200, chunk_overlap: int = 200)
     return chunks
 
 
-def _cosine_similarity(vec_a: List[float], vec_b: List[float]) -> float:
+def _vector_norm(vec: List[float]) -> float:
+    return math.sqrt(math.sumprod(vec, vec))
+
+
+def _normalize(vec: List[float]) -> List[float]:
+    norm = _vector_norm(vec)
+    if norm == 0:
+        return vec
+    return [x / norm for x in vec]
+
+
+def _cosine_similarity(vec_a: List[float], vec_b: List[float], *, norm_a: Optional[float] = None) -> float:
+    """Cosine similarity of two embeddings.
+
+    ``norm_a`` may carry the precomputed norm of ``vec_a`` when one query is
+    scored against many candidates; it is ignored if the vectors need truncating.
+    """
     if not vec_a or not vec_b:
         return 0.0
     if len(vec_a) != len(vec_b):
@@ -40,9 +61,12 @@ def _cosine_similarity(vec_a: List[float], vec_b: List[float]) -> float:
         n = min(len(vec_a), len(vec_b))
         vec_a = vec_a[:n]
         vec_b = vec_b[:n]
-    dot = sum(a * b for a, b in zip(vec_a, vec_b))
-    norm_a = math.sqrt(sum(a * a for a in vec_a))
-    norm_b = math.sqrt(sum(b * b for b in vec_b))
+        norm_a = None
+    # math.sumprod runs each reduction in a single C-level pass
+    dot = math.sumprod(vec_a, vec_b)
+    if norm_a is None:
+        norm_a = _vector_norm(vec_a)
+    norm_b = _vector_norm(vec_b)
     if norm_a == 0 or norm_b == 0:
         return 0.0
     return dot / (norm_a * norm_b)
@@ -106,8 +130,10 @@ async def process_uploaded_file(
     # Chunk text and embed
     chunks = _split_text(text)
     embeddings = await _embed_texts(client, chunks)
+    # Store unit vectors: components stay within [-1, 1], which keeps the
+    # float16 copy written by the repository precise
     chunk_payload: List[Tuple[int, str, List[float]]] = [
-        (idx, chunk, embeddings[idx]) for idx, chunk in enumerate(chunks)
+        (idx, chunk, _normalize(embeddings[idx])) for idx, chunk in enumerate(chunks)
     ]
     await repo.insert_chunk_embeddings(
         document_id=doc_id,
@@ -152,7 +178,51 @@ async def _generate_description(client: AsyncOpenAI, text: str) -> str:
             return ""
 
 
+@lru_cache(maxsize=1)
+def _pypdf_reader():
+    """Import ``pypdf.PdfReader`` on first use and keep the reference.
+
+    Optional parsers stay out of module import (fast cold start) while later
+    uploads skip the import machinery entirely.
+    """
+    from pypdf import PdfReader  # type: ignore
+
+    return PdfReader
+
+
+@lru_cache(maxsize=1)
+def _docx():
+    """Import ``python-docx`` on first use and keep the module reference."""
+    import docx  # type: ignore
+
+    return docx
+
+
+def _safe_extract_page(page, page_number: int) -> Optional[str]:
+    """Extract text from a single PDF page, returning None (and logging) when pypdf fails."""
+    try:
+        return page.extract_text() or ""
+    except Exception:
+        logger.warning("Failed to extract text from PDF page %d", page_number, exc_info=True)
+        return None
+
+
+def _extract_pdf_pages(reader) -> List[Optional[str]]:
+    """Extract every page of a PDF in order.
+
+    Pages are read one after another: a ``PdfReader`` shares one stream across
+    its pages and is not thread-safe. Callers already run this in a worker
+    thread. Pages that failed to extract are returned as None.
+    """
+    return [_safe_extract_page(page, number) for number, page in enumerate(reader.pages, start=1)]
+
+
 async def _extract_text(path: str, mime_type: str) -> str:
+    """Extract the full text of a stored file without blocking the event loop."""
+    return await asyncio.to_thread(_extract_text_sync, path, mime_type)
+
+
+def _extract_text_sync(path: str, mime_type: str) -> str:
     # Handle simple text types
     if mime_type.startswith("text/") or mime_type in ("application/json",):
         with open(path, "r", encoding="utf-8", errors="ignore") as f:
@@ -161,25 +231,17 @@ async def _extract_text(path: str, mime_type: str) -> str:
     # Basic PDF support via pypdf if installed
     if mime_type == "application/pdf":
         try:
-            from pypdf import PdfReader  # type: ignore
-
+            PdfReader = _pypdf_reader()
             reader = PdfReader(path)
-            text = []
-            for page in reader.pages:
-                try:
-                    text.append(page.extract_text() or "")
-                except Exception:
-                    continue
-            return "\n".join(text)
+            pages = _extract_pdf_pages(reader)
+            return "\n".join(t for t in pages if t is not None)
         except Exception:
             return ""
 
     # Basic DOCX support via python-docx if installed
     if mime_type in ("application/vnd.openxmlformats-officedocument.wordprocessingml.document", "application/msword"):
         try:
-            import docx  # type: ignore
-
-            doc = docx.Document(path)
+            doc = _docx().Document(path)
             return "\n".join(p.text for p in doc.paragraphs)
         except Exception:
             return ""
@@ -193,6 +255,15 @@ async def _extract_text(path: str, mime_type: str) -> str:
 
 
 async def _extract_title_and_text(path: str, mime_type: str) -> Tuple[Optional[str], str]:
+    """Run ``_extract_title_and_text_sync`` in a worker thread.
+
+    File reads and pypdf/docx parsing are blocking, so they are kept off the
+    event loop that also serves the SSE chat stream.
+    """
+    return await asyncio.to_thread(_extract_title_and_text_sync, path, mime_type)
+
+
+def _extract_title_and_text_sync(path: str, mime_type: str) -> Tuple[Optional[str], str]:
     """Best-effort extraction of a human-friendly title and full text.
 
     - For PDFs, prefer metadata title; otherwise use the first non-empty line on page 1.
@@ -205,20 +276,12 @@ async def _extract_title_and_text(path: str, mime_type: str) -> Tuple[Optional[s
     # PDF path (try metadata and first page headers)
     if mime_type == "application/pdf":
         try:
-            from pypdf import PdfReader  # type: ignore
-
+            PdfReader = _pypdf_reader()
             reader = PdfReader(path)
             # Extract text across all pages
-            pages_text: List[str] = []
-            first_page_text: str = ""
-            for idx, page in enumerate(reader.pages):
-                try:
-                    page_text = page.extract_text() or ""
-                    pages_text.append(page_text)
-                    if idx == 0:
-                        first_page_text = page_text
-                except Exception:
-                    continue
+            pages = _extract_pdf_pages(reader)
+            pages_text: List[str] = [t for t in pages if t is not None]
+            first_page_text: str = (pages[0] or "") if pages else ""
 
             # Title from metadata if present
             try:
@@ -248,9 +311,7 @@ async def _extract_title_and_text(path: str, mime_type: str) -> Tuple[Optional[s
     # DOCX path
     if mime_type in ("application/vnd.openxmlformats-officedocument.wordprocessingml.document", "application/msword"):
         try:
-            import docx  # type: ignore
-
-            doc = docx.Document(path)
+            doc = _docx().Document(path)
             paragraphs = [p.text for p in doc.paragraphs]
             text = "\n".join(paragraphs)
             for p in paragraphs:
@@ -298,33 +359,49 @@ async def retrieve_context(
     # Embed query
     query_vec = (await _embed_texts(client, [query]))[0]
 
+    # Prefer pgvector ANN lookups; fall back to scanning embeddings in Python
+    use_index = len(query_vec) == KB_EMBEDDING_DIMENSIONS and await repo.vector_search_available()
+
     # Determine candidate documents
     candidate_doc_ids: List[str] = []
     if mode == "file" and file_id:
         candidate_doc_ids = [file_id]
+    elif use_index:
+        docs = await repo.search_documents_by_embedding(query_vec, limit=max_docs)
+        candidate_doc_ids = [d["id"] for d in docs if d["score"] > 0.2]
     else:
         # Rank documents by similarity of doc_embedding
+        query_norm = _vector_norm(query_vec)
         docs = await repo.list_all_doc_embeddings()
         scored: List[Tuple[str, float, str]] = []  # (doc_id, score, title)
         for d in docs:
             emb = d.get("doc_embedding") or []
-            sim = _cosine_similarity(query_vec, emb)
+            sim = _cosine_similarity(query_vec, emb, norm_a=query_norm)
             scored.append((d["id"], sim, d.get("filename", "")))
-        scored.sort(key=lambda x: x[1], reverse=True)
-        candidate_doc_ids = [d[0] for d in scored[:max_docs] if d[1] > 0.2]
+        # Partial top-K selection; no need to fully sort every document
+        top_docs = heapq.nlargest(max_docs, scored, key=lambda x: x[1])
+        candidate_doc_ids = [d[0] for d in top_docs if d[1] > 0.2]
 
     if not candidate_doc_ids:
         return {"chunks": [], "doc_ids": []}
 
+    if use_index:
+        chunks = await repo.search_chunks_by_embedding(
+            query_vec, document_ids=candidate_doc_ids, limit=max_chunks
+        )
+        top = [ch for ch in chunks if ch["score"] > 0.2]
+        return {"chunks": top, "doc_ids": candidate_doc_ids}
+
     # Pull chunks for those documents and rank by similarity
+    query_norm = _vector_norm(query_vec)
     chunks = await repo.list_chunks_for_documents(candidate_doc_ids)
     scored_chunks: List[Tuple[float, Dict[str, any]]] = []
     for ch in chunks:
         emb = ch.get("embedding") or []
-        sim = _cosine_similarity(query_vec, emb)
+        sim = _cosine_similarity(query_vec, emb, norm_a=query_norm)
         scored_chunks.append((sim, ch))
-    scored_chunks.sort(key=lambda x: x[0], reverse=True)
-    top = [chunk for sim, chunk in scored_chunks[:max_chunks] if sim > 0.2]
+    top_chunks = heapq.nlargest(max_chunks, scored_chunks, key=lambda x: x[0])
+    top = [chunk for sim, chunk in top_chunks if sim > 0.2]
     return {"chunks": top, "doc_ids": candidate_doc_ids}
 
 
@@ -6,7 +6,7 @@ A comprehensive system for managing and routing to multiple MCP servers.
 
 from .config import settings
 from .mcp_client_manager import MCPClientManager, MCPRequest, MCPResponse
-from .mcp_integration_routes import router as mcp_router
+from .mcp_integration_routes import router as mcp_router, lifespan as mcp_lifespan
 
 __version__ = "1.0.0"
 __all__ = [
@@ -14,5 +14,6 @@ __all__ = [
     "MCPClientManager",
     "MCPRequest",
     "MCPResponse",
-    "mcp_router"
+    "mcp_router",
+    "mcp_lifespan"
 ] 
\ No newline at end of file
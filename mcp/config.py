@@ -5,7 +5,11 @@ Configuration settings for the MCP registry service.
 Uses pydantic-settings for environment variable support.
 """
 
-from typing import Optional, List
+import json
+import logging
+import os
+import tempfile
+from typing import Optional, List, Tuple
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -13,6 +17,7 @@ class Settings(BaseSettings):
     """Application settings with environment variable support."""
     
     model_config = SettingsConfigDict(
+        env_prefix="MCP_",
         env_file=".env",
         env_file_encoding="utf-8",
         case_sensitive=False
@@ -30,8 +35,17 @@ class Settings(BaseSettings):
     
     # Database settings
     database_url: str = "sqlite:///./mcp_registry.db"
-    database_pool_size: int = 5
-    database_max_overflow: int = 10
+    # Connections across all `workers`; each worker process gets its own pool,
+    # so this must stay below the server's max_connections (PostgreSQL: 100)
+    database_max_connections: int = 80
+    # Per-worker overrides; by default each is half of the worker's share
+    database_pool_size: Optional[int] = None
+    database_max_overflow: Optional[int] = None
+    database_pool_timeout: float = 5.0  # seconds to wait for a pooled connection
+    database_pool_recycle: int = 1800  # seconds before a connection is replaced
+    # Run create_all on startup (local development); otherwise manage the
+    # schema with `alembic -c mcp/alembic.ini upgrade head`
+    auto_create_schema: bool = False
     
     # Redis settings (for caching and task queue)
     redis_url: Optional[str] = "redis://localhost:6379"
@@ -49,9 +63,13 @@ class Settings(BaseSettings):
     cors_allow_headers: List[str] = ["*"]
     
     # MCP Client settings
+    registry_url: str = "http://localhost:8000"
+    warmup_user_ids: List[str] = []  # users whose servers are pre-connected on startup
     max_connections_per_server: int = 5
     connection_timeout: int = 30
     health_check_interval: int = 60  # seconds
+    # Held by the one worker per host that runs the background health monitor
+    health_monitor_lock_file: str = os.path.join(tempfile.gettempdir(), "mcp_registry_health.lock")
     
     # Rate limiting
     rate_limit_enabled: bool = True
@@ -69,9 +87,6 @@ class Settings(BaseSettings):
     enable_websocket: bool = True
     enable_batch_operations: bool = True
     enable_health_monitoring: bool = True
-    
-    class Config:
-        env_prefix = "MCP_"
 
 
 # Create global settings instance
@@ -84,6 +99,35 @@ def get_database_url() -> str:
     return settings.database_url
 
 
+def get_database_pool_limits() -> Tuple[int, int]:
+    """Get ``(pool_size, max_overflow)`` for one worker process.
+    
+    Splits ``database_max_connections`` evenly across ``workers`` so the
+    pools of all workers together never exceed it.
+    """
+    per_worker = max(settings.database_max_connections // max(settings.workers, 1), 2)
+    pool_size = settings.database_pool_size
+    if pool_size is None:
+        pool_size = per_worker // 2
+    max_overflow = settings.database_max_overflow
+    if max_overflow is None:
+        max_overflow = per_worker - pool_size
+    return pool_size, max_overflow
+
+
+def get_async_database_url() -> str:
+    """Get the database URL rewritten for an asyncio driver (asyncpg / aiosqlite)."""
+    url = get_database_url()
+    for prefix, async_prefix in (
+        ("postgresql://", "postgresql+asyncpg://"),
+        ("postgres://", "postgresql+asyncpg://"),
+        ("sqlite://", "sqlite+aiosqlite://"),
+    ):
+        if url.startswith(prefix):
+            return async_prefix + url[len(prefix):]
+    return url
+
+
 def get_redis_client():
     """Get Redis client for caching."""
     if settings.redis_url:
@@ -94,4 +138,29 @@ def get_redis_client():
 
 def is_production() -> bool:
     """Check if running in production mode."""
-    return not settings.debug 
\ No newline at end of file
+    return not settings.debug
+
+
+class JsonLogFormatter(logging.Formatter):
+    """Format log records as single-line JSON objects."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_logging():
+    """Configure root logging from ``log_level`` and ``log_format`` settings."""
+    handler = logging.StreamHandler()
+    if settings.log_format == "json":
+        handler.setFormatter(JsonLogFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    logging.basicConfig(level=settings.log_level.upper(), handlers=[handler], force=True) 
\ No newline at end of file
@@ -0,0 +1,8 @@
+#!/bin/sh
+# Bring the registry schema up to date before starting the service.
+# Runs once per container, ahead of the uvicorn workers.
+set -e
+
+alembic -c mcp/alembic.ini upgrade head
+
+exec "$@"
@@ -7,61 +7,169 @@ lazy loading, and health monitoring capabilities.
 
 import asyncio
 import json
-from collections import defaultdict
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Set
+import logging
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, FrozenSet, List, MutableMapping, Optional, Sequence, Set, Tuple
 from uuid import UUID
 
 import httpx
+from cachetools import TTLCache
 from fastmcp import Client
 from pydantic import BaseModel, Field
 
+def _create_http_client() -> httpx.AsyncClient:
+    """Create the keep-alive HTTP client shared by registry and health-check calls."""
+    return httpx.AsyncClient(
+        timeout=10.0,
+        limits=httpx.Limits(max_keepalive_connections=100, max_connections=100),
+        http2=True,
+    )
+
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def _tool_to_dict(tool: Any) -> Dict[str, Any]:
+    """Convert a FastMCP tool object into the dict shape returned by discovery."""
+    tool_dict = {
+        "name": tool.name,
+        "description": getattr(tool, "description", ""),
+    }
+    # Single getattr with a sentinel instead of hasattr + attribute access
+    parameters = getattr(tool, "parameters", _MISSING)
+    if parameters is not _MISSING:
+        tool_dict["parameters"] = parameters
+    return tool_dict
+
+
+@dataclass(eq=False)
+class PooledClient:
+    """A pooled FastMCP client and whether its session has been opened."""
+    client: Client
+    connected: bool = False
+
+
 class MCPConnectionPool:
     """Manages a pool of connections to MCP servers."""
     
-    def __init__(self, max_connections_per_server: int = 5, connection_timeout: int = 30):
+    def __init__(
+        self,
+        max_connections_per_server: int = 5,
+        connection_timeout: int = 30,
+        http_client: Optional[httpx.AsyncClient] = None,
+        pool_timeout: Optional[float] = 30.0,
+        health_ttl: float = 10.0,
+        max_idle_seconds: float = 300.0,
+        max_cached_servers: int = 10_000
+    ):
         self.max_connections_per_server = max_connections_per_server
         self.connection_timeout = connection_timeout
-        self._pools: Dict[str, List[Client]] = defaultdict(list)
-        self._active_connections: Dict[str, Set[Client]] = defaultdict(set)
+        # Max seconds to wait for a free connection (None waits indefinitely)
+        self.pool_timeout = pool_timeout
+        # Reuse the caller's HTTP client when given; otherwise own one
+        self._owns_http = http_client is None
+        self._http = http_client or _create_http_client()
+        # Idle clients per server as (client, released_at); released on the
+        # left and reused from the right so every client gets exercised
+        self.max_idle_seconds = max_idle_seconds
+        self._pools: Dict[str, Deque[Tuple[PooledClient, float]]] = defaultdict(deque)
+        self._reaper: Optional[asyncio.Task] = None
+        self._active_connections: Dict[str, Set[PooledClient]] = defaultdict(set)
+        # Slots claimed by connections that are still being created
+        self._reserved: Dict[str, int] = defaultdict(int)
         self._server_configs: Dict[str, Dict[str, Any]] = {}
-        self._last_health_check: Dict[str, datetime] = {}
-        self._lock = asyncio.Lock()
+        # Monotonic timestamps; wall-clock time is only used for reported fields
+        self._last_health_check: Dict[str, float] = {}
+        # Health results cached per server: server_id -> (monotonic checked_at, result)
+        self._health_ttl = health_ttl
+        self._health_cache: MutableMapping[str, Tuple[float, Dict[str, Any]]] = TTLCache(
+            maxsize=max_cached_servers, ttl=health_ttl
+        )
+        self._health_refreshes: Dict[str, asyncio.Task] = {}
+        # One condition per server so acquisitions for different servers never
+        # contend; created lazily (inserting into the dict never yields)
+        self._available: Dict[str, asyncio.Condition] = defaultdict(asyncio.Condition)
+    
+    def _can_acquire(self, server_id: str) -> bool:
+        """Whether a pooled client is idle or a new one fits under the cap."""
+        in_use = len(self._active_connections[server_id]) + self._reserved[server_id]
+        return bool(self._pools[server_id]) or in_use < self.max_connections_per_server
     
-    async def get_connection(self, server_id: str, server_url: str, config: Dict[str, Any]) -> Client:
-        """Get a connection from the pool or create a new one."""
-        async with self._lock:
+    async def get_connection(
+        self,
+        server_id: str,
+        server_url: str,
+        config: Dict[str, Any],
+        pool_timeout: Optional[float] = None
+    ) -> PooledClient:
+        """Get a connection from the pool or create a new one.
+        
+        Returned clients are always connected; the MCP session is opened once
+        when the connection is created, never on checkout.
+        
+        When the server is at ``max_connections_per_server`` the caller waits
+        until a connection is released, up to ``pool_timeout`` seconds
+        (defaulting to the pool-wide setting).
+        """
+        timeout = self.pool_timeout if pool_timeout is None else pool_timeout
+        available = self._available[server_id]
+        
+        async with available:
             # Store server config for later use
             self._server_configs[server_id] = {
                 "url": server_url,
                 "config": config
             }
             
+            try:
+                await asyncio.wait_for(
+                    available.wait_for(lambda: self._can_acquire(server_id)),
+                    timeout
+                )
+            except asyncio.TimeoutError:
+                raise Exception(
+                    f"Timed out after {timeout}s waiting for a connection to server {server_id}"
+                )
+            
             # Check if we have available connections in the pool
             if self._pools[server_id]:
-                client = self._pools[server_id].pop()
-                self._active_connections[server_id].add(client)
-                return client
-            
-            # Create new connection if under limit
-            if len(self._active_connections[server_id]) < self.max_connections_per_server:
-                client = await self._create_connection(server_id, server_url, config)
+                client, _ = self._pools[server_id].pop()
                 self._active_connections[server_id].add(client)
                 return client
             
-            # Wait for available connection
-            # In production, implement proper waiting mechanism
-            raise Exception(f"Connection pool exhausted for server {server_id}")
+            # Claim a slot and create the connection outside the lock
+            self._reserved[server_id] += 1
+        
+        try:
+            client = await self._create_connection(server_id, server_url, config)
+        except Exception:
+            async with available:
+                self._reserved[server_id] -= 1
+                available.notify_all()
+            raise
+        
+        async with available:
+            self._reserved[server_id] -= 1
+            self._active_connections[server_id].add(client)
+        return client
     
-    async def release_connection(self, server_id: str, client: Client):
-        """Return a connection to the pool."""
-        async with self._lock:
+    async def release_connection(self, server_id: str, client: PooledClient):
+        """Return a connection to the pool and wake any waiters."""
+        available = self._available[server_id]
+        async with available:
             if client in self._active_connections[server_id]:
                 self._active_connections[server_id].remove(client)
-                self._pools[server_id].append(client)
+                self._pools[server_id].appendleft((client, time.monotonic()))
+                # Only waiters for this server share the condition
+                available.notify_all()
     
-    async def _create_connection(self, server_id: str, server_url: str, config: Dict[str, Any]) -> Client:
-        """Create a new MCP client connection."""
+    async def _create_connection(self, server_id: str, server_url: str, config: Dict[str, Any]) -> PooledClient:
+        """Create a new MCP client connection and open its session."""
         # Create appropriate client based on URL/transport type
         # FastMCP Client auto-detects transport from URL format
         
@@ -76,92 +184,457 @@ class MCPConnectionPool:
         else:
             client = Client(server_url)
         
-        return client
+        # Connect once here so checkout never has to
+        await client.__aenter__()
+        return PooledClient(client, connected=True)
     
     async def close_all_connections(self, server_id: Optional[str] = None):
         """Close all connections for a specific server or all servers."""
-        async with self._lock:
-            servers = [server_id] if server_id else list(self._pools.keys())
-            
-            for sid in servers:
-                # Close pooled connections
-                for client in self._pools[sid]:
-                    # await client.close()
-                    pass
+        servers = [server_id] if server_id else list(self._pools.keys())
+        
+        to_close: List[PooledClient] = []
+        for sid in servers:
+            available = self._available[sid]
+            async with available:
+                # Close pooled and active connections
+                to_close.extend(pooled for pooled, _ in self._pools[sid])
                 self._pools[sid].clear()
-                
-                # Close active connections
-                for client in self._active_connections[sid]:
-                    # await client.close()
-                    pass
+                to_close.extend(self._active_connections[sid])
                 self._active_connections[sid].clear()
+                available.notify_all()
+        
+        for pooled in to_close:
+            await self._close_client(pooled)
+    
+    @staticmethod
+    async def _close_client(pooled: PooledClient):
+        if pooled.connected:
+            pooled.connected = False
+            try:
+                await pooled.client.__aexit__(None, None, None)
+            except Exception:
+                pass
+    
+    def start_reaper(self):
+        """Start the background task that closes clients idle past ``max_idle_seconds``."""
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap_idle())
+    
+    async def _reap_idle(self):
+        while True:
+            await asyncio.sleep(self.max_idle_seconds / 2)
+            cutoff = time.monotonic() - self.max_idle_seconds
+            
+            stale: List[PooledClient] = []
+            for sid, idle in list(self._pools.items()):
+                async with self._available[sid]:
+                    # The right end holds the longest-idle clients
+                    while idle and idle[-1][1] < cutoff:
+                        stale.append(idle.pop()[0])
+            
+            for pooled in stale:
+                await self._close_client(pooled)
     
     async def health_check(self, server_id: str) -> Dict[str, Any]:
-        """Perform health check on a specific server."""
+        """Perform health check on a specific server.
+        
+        Results are cached per server for ``health_ttl`` seconds. Once a cached
+        result is older than half the TTL it is still returned immediately,
+        while a background task refreshes it (stale-while-revalidate).
+        """
+        # Entries older than health_ttl have already been evicted
+        cached = self._health_cache.get(server_id)
+        if cached:
+            age = time.monotonic() - cached[0]
+            if age > self._health_ttl / 2 and server_id not in self._health_refreshes:
+                self._health_refreshes[server_id] = asyncio.create_task(
+                    self._refresh_health(server_id)
+                )
+            return cached[1]
+        
+        return await self._probe_health(server_id)
+    
+    async def _refresh_health(self, server_id: str):
+        try:
+            await self._probe_health(server_id)
+        finally:
+            self._health_refreshes.pop(server_id, None)
+    
+    async def _probe_health(self, server_id: str) -> Dict[str, Any]:
+        """Hit the server's health endpoint and cache the outcome."""
+        config = self._server_configs.get(server_id)
+        if not config:
+            return {"status": "error", "message": "Server not configured"}
+        
         try:
-            config = self._server_configs.get(server_id)
-            if not config:
-                return {"status": "error", "message": "Server not configured"}
-            
             # Simple HTTP health check
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{config['url']}/health",
-                    timeout=5.0
-                )
-                
-                self._last_health_check[server_id] = datetime.utcnow()
-                
-                if response.status_code == 200:
-                    return {"status": "healthy", "response_time": response.elapsed.total_seconds()}
-                else:
-                    return {"status": "unhealthy", "status_code": response.status_code}
+            response = await self._http.get(
+                f"{config['url']}/health",
+                timeout=5.0
+            )
+            
+            checked_at = time.monotonic()
+            self._last_health_check[server_id] = checked_at
+            
+            if response.status_code == 200:
+                result = {"status": "healthy", "response_time": response.elapsed.total_seconds()}
+            else:
+                result = {"status": "unhealthy", "status_code": response.status_code}
         
         except Exception as e:
-            return {"status": "error", "message": str(e)}
+            checked_at = time.monotonic()
+            result = {"status": "error", "message": str(e)}
+        
+        result["last_check"] = datetime.utcnow().isoformat()
+        self._health_cache[server_id] = (checked_at, result)
+        return result
+    
+    async def close(self):
+        """Close all MCP connections and the pool's own HTTP client, if any."""
+        if self._reaper:
+            self._reaper.cancel()
+        for task in list(self._health_refreshes.values()):
+            task.cancel()
+        await self.close_all_connections()
+        if self._owns_http:
+            await self._http.aclose()
 
 
 class MCPRequest(BaseModel):
     """Model for MCP tool requests."""
+    
     tool_name: str
     parameters: Dict[str, Any] = Field(default_factory=dict)
     timeout: Optional[int] = 30
 
 
 class MCPResponse(BaseModel):
-    """Model for MCP tool responses."""
+    """Model for MCP tool responses.
+    
+    Built by the manager from trusted values via ``model_construct``, which
+    skips validation on the per-call path.
+    """
+    
     success: bool
     result: Optional[Any] = None
     error: Optional[str] = None
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
+class MCPCallBatcher:
+    """
+    Coalesces single tool calls to the same server into grouped executions.
+    
+    Calls submitted for a server within ``max_wait_ms`` of the first pending
+    one (or until ``max_batch_size`` are queued) share one pooled connection
+    and run concurrently on it, so pool checkout happens once per batch
+    rather than once per call.
+    """
+    
+    def __init__(
+        self,
+        connection_pool: MCPConnectionPool,
+        execute: Callable[[Client, MCPRequest], Awaitable[Any]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 5
+    ):
+        self.connection_pool = connection_pool
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._execute = execute
+        self._pending: Dict[str, List[Tuple[MCPRequest, asyncio.Future]]] = defaultdict(list)
+        self._timers: Dict[str, asyncio.Task] = {}
+        self._batches: Set[asyncio.Task] = set()
+    
+    async def submit(
+        self,
+        server_id: str,
+        server_url: str,
+        config: Dict[str, Any],
+        request: MCPRequest
+    ) -> Any:
+        """Queue a call for ``server_id`` and wait for its result."""
+        future = asyncio.get_running_loop().create_future()
+        pending = self._pending[server_id]
+        pending.append((request, future))
+        
+        if len(pending) >= self.max_batch_size:
+            timer = self._timers.pop(server_id, None)
+            if timer:
+                timer.cancel()
+            self._dispatch(server_id, server_url, config)
+        elif server_id not in self._timers:
+            self._timers[server_id] = asyncio.create_task(
+                self._flush_after_wait(server_id, server_url, config)
+            )
+        
+        return await future
+    
+    async def _flush_after_wait(self, server_id: str, server_url: str, config: Dict[str, Any]):
+        await asyncio.sleep(self.max_wait)
+        self._timers.pop(server_id, None)
+        self._dispatch(server_id, server_url, config)
+    
+    def _dispatch(self, server_id: str, server_url: str, config: Dict[str, Any]):
+        batch = self._pending.pop(server_id, [])
+        if not batch:
+            return
+        task = asyncio.create_task(self._run_batch(server_id, server_url, config, batch))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+    
+    async def _run_batch(
+        self,
+        server_id: str,
+        server_url: str,
+        config: Dict[str, Any],
+        batch: List[Tuple[MCPRequest, asyncio.Future]]
+    ):
+        results = await self.run_now(server_id, server_url, config, [request for request, _ in batch])
+        
+        for (_, future), result in zip(batch, results):
+            # Skip callers that were cancelled while waiting
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+    
+    async def run_now(
+        self,
+        server_id: str,
+        server_url: str,
+        config: Dict[str, Any],
+        requests: Sequence[MCPRequest]
+    ) -> List[Any]:
+        """Run an already-grouped set of calls on one pooled connection.
+        
+        Skips the coalescing wait. Each slot of the returned list holds the
+        call's result or the exception it raised.
+        """
+        try:
+            pooled = await self.connection_pool.get_connection(server_id, server_url, config)
+            try:
+                return await asyncio.gather(
+                    *[self._execute(pooled.client, request) for request in requests],
+                    return_exceptions=True
+                )
+            finally:
+                await self.connection_pool.release_connection(server_id, pooled)
+        except Exception as e:
+            return [e] * len(requests)
+    
+    async def close(self):
+        """Cancel pending flushes and fail calls that have not been dispatched."""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        for batch in self._pending.values():
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(Exception("MCP client manager is closing"))
+        self._pending.clear()
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+
+
 class MCPClientManager:
     """
     High-level manager for MCP client operations.
     Handles routing, load balancing, and failover.
     """
     
-    def __init__(self, registry_url: str = "http://localhost:8000"):
+    def __init__(
+        self,
+        registry_url: str = "http://localhost:8000",
+        max_batch_size: int = 8,
+        max_wait_ms: float = 5,
+        max_concurrency: int = 16,
+        max_cached_servers: int = 10_000,
+        max_cached_users: int = 100_000,
+        user_cache_ttl: float = 3600.0
+    ):
         self.registry_url = registry_url
-        self.connection_pool = MCPConnectionPool()
-        self._server_cache: Dict[str, Dict[str, Any]] = {}
-        self._cache_ttl = timedelta(minutes=5)
-        self._last_cache_update = datetime.min
-        self._user_servers: Dict[str, List[Dict[str, Any]]] = {}
-    
-    async def initialize_user_servers(self, user_id: str):
-        """Load user-specific server configurations from registry."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.registry_url}/users/servers",
-                params={"user_id": user_id, "enabled_only": True}
+        # Cap on in-flight server groups per batch_call_tools invocation
+        self.max_concurrency = max_concurrency
+        # One keep-alive client for all registry and health-check traffic
+        self._http = _create_http_client()
+        self.connection_pool = MCPConnectionPool(
+            http_client=self._http,
+            max_cached_servers=max_cached_servers
+        )
+        self._batcher = MCPCallBatcher(
+            self.connection_pool,
+            self._execute_tool,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms
+        )
+        self._cache_ttl = 300.0  # seconds
+        # Size-capped TTL caches; each entry expires on its own and the least
+        # recently used entries are evicted once a cache is full
+        self._server_cache: MutableMapping[str, Dict[str, Any]] = TTLCache(
+            maxsize=max_cached_servers, ttl=self._cache_ttl
+        )
+        self._server_fetches: Dict[str, asyncio.Task] = {}
+        self._tool_cache: MutableMapping[str, List[Dict[str, Any]]] = TTLCache(
+            maxsize=max_cached_servers, ttl=self._cache_ttl
+        )
+        self._tool_fetches: Dict[str, asyncio.Task] = {}
+        # user_id -> (server list, enabled server_ids); one entry so both halves
+        # always expire together and access checks stay O(1)
+        self._user_servers: MutableMapping[
+            str, Tuple[List[Dict[str, Any]], FrozenSet[str]]
+        ] = TTLCache(maxsize=max_cached_users, ttl=user_cache_ttl)
+        self._user_fetches: Dict[str, asyncio.Task] = {}
+        # Users seen within user_cache_ttl; their registry data is kept fresh
+        # by one background task each so requests only read from memory
+        self._user_seen: MutableMapping[str, bool] = TTLCache(
+            maxsize=max_cached_users, ttl=user_cache_ttl
+        )
+        self._refresh_tasks: Dict[str, asyncio.Task] = {}
+        # Refreshes the configs of servers enabled for any active user, once per server
+        self._server_refresh_task: Optional[asyncio.Task] = None
+    
+    async def initialize_user_servers(self, user_id: str, force: bool = False):
+        """Load user-specific server configurations from registry.
+        
+        Idempotent: already-loaded users are skipped unless ``force`` is set,
+        and concurrent loads for one user share a single registry request.
+        After the first load a background task keeps the data refreshed.
+        """
+        self._user_seen[user_id] = True
+        if not force and user_id in self._user_servers:
+            return True
+        
+        return await self._single_flight(
+            self._user_fetches,
+            user_id,
+            lambda: self._fetch_user_servers(user_id)
+        )
+    
+    async def _fetch_user_servers(self, user_id: str) -> bool:
+        response = await self._http.get(
+            f"{self.registry_url}/users/servers",
+            params={"user_id": user_id, "enabled_only": True}
+        )
+        
+        if response.status_code == 200:
+            user_servers = response.json()
+            self._user_servers[user_id] = (
+                user_servers,
+                frozenset(s["server_id"] for s in user_servers if s.get("enabled", False))
             )
+            if user_id not in self._refresh_tasks:
+                task = asyncio.create_task(self._refresh_loop(user_id))
+                self._refresh_tasks[user_id] = task
+                task.add_done_callback(lambda done: self._discard_refresh_task(user_id, done))
+            if self._server_refresh_task is None or self._server_refresh_task.done():
+                self._server_refresh_task = asyncio.create_task(self._server_refresh_loop())
+            return True
+        return False
+    
+    def _discard_refresh_task(self, user_id: str, task: asyncio.Task):
+        # A cancelled loop may finish after the user was re-initialized; leave
+        # the replacement task registered
+        if self._refresh_tasks.get(user_id) is task:
+            del self._refresh_tasks[user_id]
+    
+    async def _refresh_loop(self, user_id: str):
+        """Re-fetch a user's server list until the user goes idle."""
+        # Refresh at half the TTL so cached entries never expire under an active user
+        interval = self._cache_ttl / 2
+        while True:
+            await asyncio.sleep(interval)
+            if user_id not in self._user_seen:
+                return
             
-            if response.status_code == 200:
-                self._user_servers[user_id] = response.json()
-                return True
-            return False
+            try:
+                await self._single_flight(
+                    self._user_fetches,
+                    user_id,
+                    lambda: self._fetch_user_servers(user_id)
+                )
+            except Exception:
+                logger.warning("Error refreshing servers for user %s", user_id, exc_info=True)
+    
+    async def _server_refresh_loop(self):
+        """Re-fetch each server enabled for an active user once per interval.
+        
+        Server configs are shared between users, so registry load grows with
+        the number of servers rather than users x servers. Exits once no user
+        is being refreshed; the next user load starts it again.
+        """
+        interval = self._cache_ttl / 2
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def refresh(server_id: str):
+            async with semaphore:
+                await self._single_flight(
+                    self._server_fetches,
+                    server_id,
+                    lambda: self._fetch_server_config(server_id)
+                )
+        
+        while self._refresh_tasks:
+            await asyncio.sleep(interval)
+            server_ids = list(frozenset().union(
+                *[self._enabled_servers(user_id) for user_id in list(self._refresh_tasks)]
+            ))
+            results = await asyncio.gather(
+                *[refresh(server_id) for server_id in server_ids],
+                return_exceptions=True
+            )
+            for server_id, result in zip(server_ids, results):
+                if isinstance(result, BaseException):
+                    logger.warning("Error refreshing server %s", server_id, exc_info=result)
+    
+    def forget_user(self, user_id: str):
+        """Drop a user's cached servers and stop refreshing them (e.g. on logout)."""
+        task = self._refresh_tasks.pop(user_id, None)
+        if task:
+            task.cancel()
+        self._user_seen.pop(user_id, None)
+        self._user_servers.pop(user_id, None)
+    
+    async def warmup(self, prefetch_user_ids: Sequence[str] = (), max_concurrency: int = 16):
+        """Pre-load registry data and open one pooled connection per server.
+        
+        Loads each user's server list, caches every enabled server's config and
+        performs the MCP handshake up front so the first tool call does not pay
+        for it. Failures are reported per server and never raised.
+        """
+        await asyncio.gather(
+            *[self.initialize_user_servers(user_id) for user_id in prefetch_user_ids],
+            return_exceptions=True
+        )
+        
+        server_ids = frozenset().union(
+            *[self._enabled_servers(user_id) for user_id in prefetch_user_ids]
+        )
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def warm(server_id: str):
+            async with semaphore:
+                server_config = await self._get_server_config(server_id)
+                if not server_config:
+                    return
+                # Checkout opens the session; releasing keeps it pooled
+                pooled = await self.connection_pool.get_connection(
+                    server_id,
+                    server_config["url"],
+                    server_config.get("config", {})
+                )
+                await self.connection_pool.release_connection(server_id, pooled)
+        
+        server_ids = list(server_ids)
+        results = await asyncio.gather(
+            *[warm(server_id) for server_id in server_ids],
+            return_exceptions=True
+        )
+        for server_id, result in zip(server_ids, results):
+            if isinstance(result, BaseException):
+                logger.warning("Error warming up server %s", server_id, exc_info=result)
     
     async def call_tool(
         self,
@@ -174,164 +647,246 @@ class MCPClientManager:
             # Get server configuration
             server_config = await self._get_server_config(server_id)
             if not server_config:
-                return MCPResponse(
+                return MCPResponse.model_construct(
                     success=False,
                     error=f"Server {server_id} not found"
                 )
             
             # Check if user has access to this server
             if not self._user_has_access(user_id, server_id):
-                return MCPResponse(
+                return MCPResponse.model_construct(
                     success=False,
                     error=f"User {user_id} does not have access to server {server_id}"
                 )
             
-            # Get connection from pool
-            client = await self.connection_pool.get_connection(
+            # Execute tool call, coalesced with concurrent calls to this server
+            result = await self._batcher.submit(
                 server_id,
                 server_config["url"],
-                server_config.get("config", {})
+                server_config.get("config", {}),
+                request
             )
             
-            try:
-                # Ensure client is connected
-                if not client.is_connected():
-                    await client.__aenter__()
-                
-                # Execute tool call using FastMCP client
-                result = await self._execute_tool(client, request)
-                
-                return MCPResponse(
-                    success=True,
-                    result=result,
-                    metadata={
-                        "server_id": server_id,
-                        "server_name": server_config.get("name"),
-                        "execution_time": datetime.utcnow().isoformat()
-                    }
-                )
-            
-            finally:
-                # Always release connection back to pool
-                await self.connection_pool.release_connection(server_id, client)
+            return self._success_response(server_id, server_config, result)
         
         except Exception as e:
-            return MCPResponse(
-                success=False,
-                error=str(e),
-                metadata={"server_id": server_id}
-            )
+            return self._error_response(server_id, e)
+    
+    async def _call_server_tools(
+        self,
+        user_id: str,
+        server_id: str,
+        requests: Sequence[MCPRequest]
+    ) -> List[MCPResponse]:
+        """Execute several tool calls on one server with a single lookup and checkout."""
+        try:
+            server_config = await self._get_server_config(server_id)
+            if not server_config:
+                error = f"Server {server_id} not found"
+            elif not self._user_has_access(user_id, server_id):
+                error = f"User {user_id} does not have access to server {server_id}"
+            else:
+                results = await self._batcher.run_now(
+                    server_id,
+                    server_config["url"],
+                    server_config.get("config", {}),
+                    requests
+                )
+                return [
+                    self._error_response(server_id, result)
+                    if isinstance(result, BaseException)
+                    else self._success_response(server_id, server_config, result)
+                    for result in results
+                ]
+        except Exception as e:
+            return [self._error_response(server_id, e)] * len(requests)
+        
+        return [MCPResponse.model_construct(success=False, error=error)] * len(requests)
+    
+    @staticmethod
+    def _success_response(server_id: str, server_config: Dict[str, Any], result: Any) -> MCPResponse:
+        return MCPResponse.model_construct(
+            success=True,
+            result=result,
+            metadata={
+                "server_id": server_id,
+                "server_name": server_config.get("name"),
+                "execution_time": datetime.utcnow().isoformat()
+            }
+        )
+    
+    @staticmethod
+    def _error_response(server_id: str, error: BaseException) -> MCPResponse:
+        return MCPResponse.model_construct(
+            success=False,
+            error=str(error),
+            metadata={"server_id": server_id}
+        )
     
     async def discover_tools(self, user_id: str) -> Dict[str, List[Dict[str, Any]]]:
-        """Discover all available tools across user's enabled servers."""
+        """Discover all available tools across user's enabled servers.
+        
+        Servers are queried concurrently and each server's tool list is cached
+        for ``_cache_ttl``, so repeated discovery makes no network calls.
+        """
         tools_by_server = {}
         
-        user_servers = self._user_servers.get(user_id, [])
-        for server_config in user_servers:
-            if not server_config.get("enabled", False):
-                continue
-            
-            server_id = server_config["server_id"]
-            server_details = await self._get_server_config(server_id)
-            
-            if server_details:
-                try:
-                    # Get a client connection to the server
-                    client = await self.connection_pool.get_connection(
-                        server_id,
-                        server_details["url"],
-                        server_details.get("config", {})
-                    )
-                    
-                    try:
-                        # Ensure client is connected
-                        if not client.is_connected():
-                            await client.__aenter__()
-                        
-                        # List tools from the actual MCP server
-                        tools = await client.list_tools()
-                        
-                        # Convert tool objects to dictionaries
-                        tool_dicts = []
-                        for tool in tools:
-                            tool_dict = {
-                                "name": tool.name,
-                                "description": tool.description if hasattr(tool, 'description') else "",
-                            }
-                            if hasattr(tool, 'parameters'):
-                                tool_dict["parameters"] = tool.parameters
-                            tool_dicts.append(tool_dict)
-                        
-                        tools_by_server[server_details["name"]] = tool_dicts
-                        
-                    finally:
-                        # Release connection back to pool
-                        await self.connection_pool.release_connection(server_id, client)
-                        
-                except Exception as e:
-                    # Log error but continue with other servers
-                    tools_by_server[server_details["name"]] = []
-                    print(f"Error discovering tools for server {server_id}: {str(e)}")
+        server_ids = list(self._enabled_servers(user_id))
+        results = await asyncio.gather(
+            *[self._discover_server_tools(server_id) for server_id in server_ids],
+            return_exceptions=True
+        )
+        
+        for server_id, result in zip(server_ids, results):
+            if isinstance(result, BaseException):
+                logger.warning("Error discovering tools for server %s", server_id, exc_info=result)
+            elif result is not None:
+                server_name, tool_dicts = result
+                tools_by_server[server_name] = tool_dicts
         
         return tools_by_server
     
+    async def _discover_server_tools(self, server_id: str) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+        """Return ``(server name, tools)`` for one server, or None if unknown."""
+        server_details = await self._get_server_config(server_id)
+        if not server_details:
+            return None
+        
+        try:
+            tool_dicts = await self._list_tools_cached(server_id, server_details)
+        except Exception:
+            # Log error but continue with other servers
+            tool_dicts = []
+            logger.warning("Error discovering tools for server %s", server_id, exc_info=True)
+        
+        return server_details["name"], tool_dicts
+    
+    async def _list_tools_cached(self, server_id: str, server_details: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Serve a server's tool list from cache, fetching it at most once at a time."""
+        tool_dicts = self._tool_cache.get(server_id)
+        if tool_dicts is not None:
+            return tool_dicts
+        
+        return await self._single_flight(
+            self._tool_fetches,
+            server_id,
+            lambda: self._fetch_tools(server_id, server_details)
+        )
+    
+    async def _fetch_tools(self, server_id: str, server_details: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """List tools from the MCP server and cache the converted result."""
+        # Get a client connection to the server
+        pooled = await self.connection_pool.get_connection(
+            server_id,
+            server_details["url"],
+            server_details.get("config", {})
+        )
+        
+        try:
+            # List tools from the actual MCP server
+            tools = await pooled.client.list_tools()
+        finally:
+            # Release connection back to pool
+            await self.connection_pool.release_connection(server_id, pooled)
+        
+        # Convert once per cache miss; discovery serves the cached dicts
+        tool_dicts = [_tool_to_dict(tool) for tool in tools]
+        
+        self._tool_cache[server_id] = tool_dicts
+        return tool_dicts
+    
     async def batch_call_tools(
         self,
         user_id: str,
-        requests: List[Dict[str, Any]]
+        requests: Sequence[Tuple[str, MCPRequest]]
     ) -> List[MCPResponse]:
-        """Execute multiple tool calls in parallel."""
-        tasks = []
-        
-        for req in requests:
-            task = self.call_tool(
-                user_id,
-                req["server_id"],
-                MCPRequest(**req["request"])
-            )
-            tasks.append(task)
+        """Execute multiple ``(server_id, request)`` tool calls in parallel.
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        Calls are grouped by server. Each group of up to ``max_batch_size``
+        calls shares one config lookup, access check and pooled connection,
+        and runs concurrently on it. At most ``max_concurrency`` groups are in
+        flight at once, so large batches queue here instead of exhausting the
+        connection pool. Responses keep the order of ``requests``.
+        """
+        indexes_by_server: Dict[str, List[int]] = defaultdict(list)
+        for index, (server_id, _) in enumerate(requests):
+            indexes_by_server[server_id].append(index)
         
-        # Convert exceptions to error responses
-        responses = []
-        for result in results:
-            if isinstance(result, Exception):
-                responses.append(MCPResponse(
-                    success=False,
-                    error=str(result)
-                ))
-            else:
-                responses.append(result)
+        step = self._batcher.max_batch_size
+        groups = [
+            (server_id, indexes[start:start + step])
+            for server_id, indexes in indexes_by_server.items()
+            for start in range(0, len(indexes), step)
+        ]
+        
+        responses: List[Optional[MCPResponse]] = [None] * len(requests)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def run(server_id: str, indexes: List[int]):
+            async with semaphore:
+                group_responses = await self._call_server_tools(
+                    user_id,
+                    server_id,
+                    [requests[index][1] for index in indexes]
+                )
+            for index, response in zip(indexes, group_responses):
+                responses[index] = response
+        
+        async with asyncio.TaskGroup() as tg:
+            for server_id, indexes in groups:
+                tg.create_task(run(server_id, indexes))
         
         return responses
     
     async def _get_server_config(self, server_id: str) -> Optional[Dict[str, Any]]:
-        """Get server configuration from cache or registry."""
-        # Check cache
-        if server_id in self._server_cache:
-            if datetime.utcnow() - self._last_cache_update < self._cache_ttl:
-                return self._server_cache[server_id]
-        
-        # Fetch from registry
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{self.registry_url}/servers/{server_id}")
-            
-            if response.status_code == 200:
-                server_data = response.json()
-                self._server_cache[server_id] = server_data
-                self._last_cache_update = datetime.utcnow()
-                return server_data
+        """Get server configuration from cache or registry.
+        
+        Concurrent misses for the same server share a single registry request.
+        """
+        server_data = self._server_cache.get(server_id)
+        if server_data is not None:
+            return server_data
+        
+        return await self._single_flight(
+            self._server_fetches,
+            server_id,
+            lambda: self._fetch_server_config(server_id)
+        )
+    
+    async def _fetch_server_config(self, server_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch a server configuration from the registry and cache it."""
+        response = await self._http.get(f"{self.registry_url}/servers/{server_id}")
+        
+        if response.status_code == 200:
+            server_data = response.json()
+            self._server_cache[server_id] = server_data
+            return server_data
         
         return None
     
+    @staticmethod
+    async def _single_flight(
+        inflight: Dict[str, asyncio.Task],
+        key: str,
+        factory: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Run ``factory()`` once per key, letting concurrent callers share the result."""
+        task = inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(factory())
+            inflight[key] = task
+            task.add_done_callback(lambda _: inflight.pop(key, None))
+        # Shield so one cancelled caller does not cancel the fetch for the rest
+        return await asyncio.shield(task)
+    
+    def _enabled_servers(self, user_id: str) -> FrozenSet[str]:
+        """Return the ids of the servers the user has enabled, if loaded."""
+        entry = self._user_servers.get(user_id)
+        return entry[1] if entry else frozenset()
+    
     def _user_has_access(self, user_id: str, server_id: str) -> bool:
         """Check if user has access to a specific server."""
-        user_servers = self._user_servers.get(user_id, [])
-        return any(
-            s["server_id"] == server_id and s.get("enabled", False)
-            for s in user_servers
-        )
+        return server_id in self._enabled_servers(user_id)
     
     async def _execute_tool(self, client: Client, request: MCPRequest) -> Any:
         """Execute tool call on MCP client."""
@@ -358,7 +913,13 @@ class MCPClientManager:
     
     async def close(self):
         """Clean up resources."""
-        await self.connection_pool.close_all_connections()
+        for task in list(self._refresh_tasks.values()):
+            task.cancel()
+        if self._server_refresh_task:
+            self._server_refresh_task.cancel()
+        await self._batcher.close()
+        await self.connection_pool.close()
+        await self._http.aclose()
 
 
 # Example usage and testing
@@ -388,20 +949,8 @@ if __name__ == "__main__":
         
         # Batch call multiple tools
         batch_requests = [
-            {
-                "server_id": "server-1",
-                "request": {
-                    "tool_name": "tool1",
-                    "parameters": {}
-                }
-            },
-            {
-                "server_id": "server-2",
-                "request": {
-                    "tool_name": "tool2",
-                    "parameters": {"key": "value"}
-                }
-            }
+            ("server-1", MCPRequest(tool_name="tool1")),
+            ("server-2", MCPRequest(tool_name="tool2", parameters={"key": "value"}))
         ]
         
         batch_responses = await manager.batch_call_tools(user_id, batch_requests)
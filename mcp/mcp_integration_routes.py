@@ -5,25 +5,47 @@ FastAPI routes that can be mounted in the main CORE backend
 to provide MCP functionality through the registry.
 """
 
+import logging
+from contextlib import asynccontextmanager
 from typing import List, Dict, Any, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, FastAPI, HTTPException
 from pydantic import BaseModel, Field
+from starlette.requests import HTTPConnection
 
+from .config import settings
 from .mcp_client_manager import MCPClientManager, MCPRequest, MCPResponse
 
+logger = logging.getLogger(__name__)
+
 # Initialize router
 router = APIRouter(prefix="/mcp", tags=["MCP Integration"])
 
-# Global client manager instance
-# In production, this should be properly initialized with dependency injection
-client_manager = MCPClientManager(registry_url="http://localhost:8000")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the shared MCP client manager on startup and close it on shutdown."""
+    manager = MCPClientManager(registry_url=settings.registry_url)
+    app.state.mcp = manager
+    manager.connection_pool.start_reaper()
+    # Pay registry round-trips and MCP handshakes before the first request
+    await manager.warmup(prefetch_user_ids=settings.warmup_user_ids)
+    try:
+        yield
+    finally:
+        await manager.close()
+
+
+async def get_client_manager(connection: HTTPConnection) -> MCPClientManager:
+    """Return the app's MCP client manager (works for HTTP and WebSocket routes)."""
+    return connection.app.state.mcp
 
 
 # Request/Response Models
 class ToolCallRequest(BaseModel):
     """Request model for calling an MCP tool."""
+    
     server_id: UUID
     tool_name: str
     parameters: Dict[str, Any] = Field(default_factory=dict)
@@ -32,6 +54,7 @@ class ToolCallRequest(BaseModel):
 
 class BatchToolCallRequest(BaseModel):
     """Request model for batch tool calls."""
+    
     calls: List[ToolCallRequest]
 
 
@@ -50,51 +73,67 @@ class ServerCapability(BaseModel):
     status: str
 
 
-# Dependency to get current user
-# This should be replaced with your actual authentication dependency
-async def get_current_user():
+# Dependencies to get current user
+# These should be replaced with your actual authentication dependency
+async def get_authenticated_user():
     """Get the current authenticated user."""
     # Placeholder - replace with actual auth logic
     return {"user_id": "test-user-123"}
 
 
+async def get_current_user(
+    user: Dict = Depends(get_authenticated_user),
+    client_manager: MCPClientManager = Depends(get_client_manager)
+):
+    """Get the current authenticated user with their MCP servers loaded."""
+    # No-op once the user's servers are loaded
+    await client_manager.initialize_user_servers(user["user_id"])
+    return user
+
+
 # Routes
 @router.post("/initialize")
 async def initialize_user_session(
-    background_tasks: BackgroundTasks,
     user: Dict = Depends(get_current_user)
 ):
     """
     Initialize MCP session for the current user.
-    Loads user's enabled servers and prepares connections.
+    The user's enabled servers are loaded by ``get_current_user`` and kept
+    fresh in the background afterwards.
     """
-    user_id = user["user_id"]
-    
-    # Initialize in background to avoid blocking
-    background_tasks.add_task(
-        client_manager.initialize_user_servers,
-        user_id
-    )
+    return {
+        "message": "MCP session initialized",
+        "user_id": user["user_id"]
+    }
+
+
+@router.post("/logout")
+async def end_user_session(
+    user: Dict = Depends(get_authenticated_user),
+    client_manager: MCPClientManager = Depends(get_client_manager)
+):
+    """
+    End the MCP session for the current user.
+    Drops their cached servers and stops refreshing them in the background.
+    """
+    client_manager.forget_user(user["user_id"])
     
     return {
-        "message": "MCP session initialization started",
-        "user_id": user_id
+        "message": "MCP session ended",
+        "user_id": user["user_id"]
     }
 
 
 @router.get("/discover", response_model=ToolDiscoveryResponse)
 async def discover_available_tools(
-    user: Dict = Depends(get_current_user)
+    user: Dict = Depends(get_current_user),
+    client_manager: MCPClientManager = Depends(get_client_manager)
 ):
     """
     Discover all available tools across user's enabled MCP servers.
     """
     user_id = user["user_id"]
     
-    # Ensure user servers are initialized
-    if user_id not in client_manager._user_servers:
-        await client_manager.initialize_user_servers(user_id)
-    
     tools_by_server = await client_manager.discover_tools(user_id)
     
     # Count total tools
@@ -109,19 +148,16 @@ async def discover_available_tools(
 @router.post("/call", response_model=MCPResponse)
 async def call_mcp_tool(
     request: ToolCallRequest,
-    user: Dict = Depends(get_current_user)
+    user: Dict = Depends(get_current_user),
+    client_manager: MCPClientManager = Depends(get_client_manager)
 ):
     """
     Call a specific tool on an MCP server.
     """
     user_id = user["user_id"]
     
-    # Ensure user servers are initialized
-    if user_id not in client_manager._user_servers:
-        await client_manager.initialize_user_servers(user_id)
-    
     # Create MCP request
-    mcp_request = MCPRequest(
+    mcp_request = MCPRequest.model_construct(
         tool_name=request.tool_name,
         parameters=request.parameters,
         timeout=request.timeout
@@ -143,27 +179,24 @@ async def call_mcp_tool(
 @router.post("/batch-call", response_model=List[MCPResponse])
 async def batch_call_tools(
     request: BatchToolCallRequest,
-    user: Dict = Depends(get_current_user)
+    user: Dict = Depends(get_current_user),
+    client_manager: MCPClientManager = Depends(get_client_manager)
 ):
     """
     Execute multiple tool calls in parallel across different MCP servers.
     """
     user_id = user["user_id"]
     
-    # Ensure user servers are initialized
-    if user_id not in client_manager._user_servers:
-        await client_manager.initialize_user_servers(user_id)
-    
-    # Prepare batch requests
+    # Calls are already validated; hand typed requests straight through
     batch_requests = [
-        {
-            "server_id": str(call.server_id),
-            "request": {
-                "tool_name": call.tool_name,
-                "parameters": call.parameters,
-                "timeout": call.timeout
-            }
-        }
+        (
+            str(call.server_id),
+            MCPRequest.model_construct(
+                tool_name=call.tool_name,
+                parameters=call.parameters,
+                timeout=call.timeout
+            )
+        )
         for call in request.calls
     ]
     
@@ -175,31 +208,22 @@ async def batch_call_tools(
 
 @router.get("/capabilities", response_model=List[ServerCapability])
 async def get_server_capabilities(
-    user: Dict = Depends(get_current_user)
+    user: Dict = Depends(get_current_user),
+    client_manager: MCPClientManager = Depends(get_client_manager)
 ):
     """
     Get detailed capabilities of all user's enabled MCP servers.
     """
     user_id = user["user_id"]
     
-    # Ensure user servers are initialized
-    if user_id not in client_manager._user_servers:
-        await client_manager.initialize_user_servers(user_id)
-    
     capabilities = []
-    user_servers = client_manager._user_servers.get(user_id, [])
     
-    for server_config in user_servers:
-        if not server_config.get("enabled", False):
-            continue
-        
-        server_details = await client_manager._get_server_config(
-            server_config["server_id"]
-        )
+    for server_id in client_manager._enabled_servers(user_id):
+        server_details = await client_manager._get_server_config(server_id)
         
         if server_details:
             capabilities.append(ServerCapability(
-                server_id=server_config["server_id"],
+                server_id=server_id,
                 server_name=server_details.get("name", "Unknown"),
                 server_type=server_details.get("server_type", "custom"),
                 tools=server_details.get("capabilities", {}).get("tools", []),
@@ -212,7 +236,8 @@ async def get_server_capabilities(
 @router.post("/health-check/{server_id}")
 async def check_server_health(
     server_id: UUID,
-    user: Dict = Depends(get_current_user)
+    user: Dict = Depends(get_current_user),
+    client_manager: MCPClientManager = Depends(get_client_manager)
 ):
     """
     Perform health check on a specific MCP server.
@@ -237,10 +262,26 @@ async def check_server_health(
 
 # WebSocket endpoint for real-time tool streaming (if needed)
 from fastapi import WebSocket, WebSocketDisconnect
-import json
+import orjson
+
+
+async def _send_message(websocket: WebSocket, payload: Dict[str, Any]):
+    """Send ``payload`` as a JSON text frame encoded with orjson."""
+    await websocket.send_text(orjson.dumps(payload).decode())
+
+
+async def _send_tool_response(websocket: WebSocket, response: MCPResponse):
+    """Send a tool response frame using the model's compiled JSON serializer."""
+    # Splice the serialized model in rather than round-tripping it through a dict
+    await websocket.send_text(
+        '{"type":"tool_response","response":' + response.model_dump_json() + "}"
+    )
 
 @router.websocket("/stream")
-async def websocket_endpoint(websocket: WebSocket):
+async def websocket_endpoint(
+    websocket: WebSocket,
+    client_manager: MCPClientManager = Depends(get_client_manager)
+):
     """
     WebSocket endpoint for real-time MCP tool streaming.
     Useful for long-running tools or tools that produce streaming output.
@@ -251,14 +292,15 @@ async def websocket_endpoint(websocket: WebSocket):
         while True:
             # Receive message
             data = await websocket.receive_text()
-            message = json.loads(data)
+            message = orjson.loads(data)
             
             # Handle different message types
             if message["type"] == "authenticate":
                 # Handle authentication
                 user_id = message.get("user_id")
+                # Loads only on a cache miss; the refresh loop keeps it current
                 await client_manager.initialize_user_servers(user_id)
-                await websocket.send_json({
+                await _send_message(websocket, {
                     "type": "authenticated",
                     "user_id": user_id
                 })
@@ -267,7 +309,9 @@ async def websocket_endpoint(websocket: WebSocket):
                 # Handle tool call
                 user_id = message.get("user_id")
                 server_id = message.get("server_id")
-                tool_request = MCPRequest(**message.get("request", {}))
+                tool_request = MCPRequest.model_validate(message.get("request", {}))
+                # Keeps the user active like get_current_user does for HTTP calls
+                await client_manager.initialize_user_servers(user_id)
                 
                 # Execute tool call
                 response = await client_manager.call_tool(
@@ -277,28 +321,26 @@ async def websocket_endpoint(websocket: WebSocket):
                 )
                 
                 # Send response
-                await websocket.send_json({
-                    "type": "tool_response",
-                    "response": response.dict()
-                })
+                await _send_tool_response(websocket, response)
             
             elif message["type"] == "ping":
                 # Handle ping
-                await websocket.send_json({"type": "pong"})
+                await _send_message(websocket, {"type": "pong"})
     
     except WebSocketDisconnect:
-        print("WebSocket disconnected")
-    except Exception as e:
-        print(f"WebSocket error: {e}")
+        logger.debug("WebSocket disconnected")
+    except Exception:
+        logger.exception("WebSocket error")
         await websocket.close()
 
 
 # Example of how to mount these routes in your main FastAPI app:
 """
 from fastapi import FastAPI
-from mcp.mcp_integration_routes import router as mcp_router
+from mcp.mcp_integration_routes import lifespan as mcp_lifespan, router as mcp_router
 
-app = FastAPI()
+# The lifespan owns the shared MCPClientManager (app.state.mcp)
+app = FastAPI(lifespan=mcp_lifespan)
 
 # Mount MCP routes
 app.include_router(mcp_router)
@@ -5,30 +5,79 @@ A FastAPI-based registry for managing and routing to multiple MCP servers.
 Provides CRUD operations, health monitoring, and per-user configurations.
 """
 
-from datetime import datetime
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 from enum import Enum
-from typing import List, Optional, Dict, Any
+from typing import IO, Annotated, List, Optional, Dict, Any
 from uuid import UUID, uuid4
 
-from fastapi import FastAPI, HTTPException, Depends, Query
+import httpx
+from cachetools import TTLCache
+from fastapi import FastAPI, HTTPException, Depends, Path, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field, HttpUrl
-from sqlalchemy import create_engine, Column, String, DateTime, Boolean, JSON, ForeignKey
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, HttpUrl, TypeAdapter, WithJsonSchema
+from sqlalchemy import (
+    Column, String, DateTime, Boolean, JSON, ForeignKey, Index, UniqueConstraint,
+    case, delete, select, text, tuple_, update
+)
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session, relationship
-from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.orm import relationship, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.dialects.postgresql import JSONB, UUID as PGUUID, insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from .config import settings, configure_logging, get_async_database_url, get_database_pool_limits
 
-from .config import settings, get_database_url
+logger = logging.getLogger(__name__)
 
-# Database setup
-SQLALCHEMY_DATABASE_URL = get_database_url()
+# Database setup (asyncpg for PostgreSQL, aiosqlite for SQLite)
+SQLALCHEMY_DATABASE_URL = get_async_database_url()
 if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+    # In-memory databases only exist on their one connection, so share it
+    engine = create_async_engine(
+        SQLALCHEMY_DATABASE_URL,
+        poolclass=StaticPool if ":memory:" in SQLALCHEMY_DATABASE_URL else None
+    )
 else:
-    engine = create_engine(SQLALCHEMY_DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    pool_size, max_overflow = get_database_pool_limits()
+    engine = create_async_engine(
+        SQLALCHEMY_DATABASE_URL,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.database_pool_timeout,
+        pool_recycle=settings.database_pool_recycle,
+        pool_pre_ping=True
+    )
+SessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+# Dialect-specific INSERT supporting ON CONFLICT clauses
+dialect_insert = sqlite_insert if engine.dialect.name == "sqlite" else pg_insert
 Base = declarative_base()
 
+# Binary JSONB on PostgreSQL (no re-parse on read); plain JSON elsewhere
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+class utcnow(FunctionElement):
+    """Current time, stamped by the database in the writing statement."""
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    return "now()"
+
+@compiles(utcnow, "sqlite")
+def _utcnow_sqlite(element, compiler, **kw):
+    # CURRENT_TIMESTAMP has whole-second precision; match the microsecond
+    # strings SQLAlchemy binds so keyset cursors compare correctly
+    return "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+
 # Enums
 class ServerStatus(str, Enum):
     ACTIVE = "active"
@@ -44,8 +93,22 @@ class ServerType(str, Enum):
     CUSTOM = "custom"
 
 # Database Models
+# Servers swept by health_loop; a partial index keeps it small
+_HEALTH_CHECKED_STATUSES = text("status IN ('active', 'error')")
+
 class MCPServer(Base):
     __tablename__ = "mcp_servers"
+    __table_args__ = (
+        Index("ix_mcp_type_status", "server_type", "status"),
+        # Keyset pagination order for list_servers (scanned backwards)
+        Index("ix_mcp_created_id", "created_at", "id"),
+        Index(
+            "ix_mcp_active",
+            "status",
+            postgresql_where=_HEALTH_CHECKED_STATUSES,
+            sqlite_where=_HEALTH_CHECKED_STATUSES
+        ),
+    )
 
     id = Column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
     name = Column(String, unique=True, index=True, nullable=False)
@@ -53,43 +116,67 @@ class MCPServer(Base):
     url = Column(String, nullable=False)
     server_type = Column(String, default=ServerType.CUSTOM)
     status = Column(String, default=ServerStatus.INACTIVE)
-    capabilities = Column(JSON, default=dict)  # Store tool names, descriptions, etc.
-    config = Column(JSON, default=dict)  # Authentication, headers, etc.
+    capabilities = Column(JSONType, default=dict)  # Store tool names, descriptions, etc.
+    config = Column(JSONType, default=dict)  # Authentication, headers, etc.
     health_check_url = Column(String)
-    last_health_check = Column(DateTime)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    last_health_check = Column(DateTime(timezone=True))
+    # Timestamps are stamped by the database in the writing statement
+    created_at = Column(DateTime(timezone=True), server_default=utcnow(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=utcnow(), onupdate=utcnow(), nullable=False)
+    
+    # Fetch server-generated values with RETURNING on flush; an AsyncSession
+    # cannot lazy-load them afterwards
+    __mapper_args__ = {"eager_defaults": True}
     
     # Relationships
     user_configs = relationship("UserServerConfig", back_populates="server")
 
 class UserServerConfig(Base):
     __tablename__ = "user_server_configs"
+    # One config per (user, server); also the conflict target for upserts.
+    # Both composites lead with user_id, so it needs no index of its own.
+    __table_args__ = (
+        UniqueConstraint("user_id", "server_id", name="uq_user_server_configs_user_server"),
+        Index("ix_usc_user_enabled", "user_id", "enabled"),
+    )
     
     id = Column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
-    user_id = Column(String, index=True, nullable=False)  # From your auth system
+    user_id = Column(String, nullable=False)  # From your auth system
     server_id = Column(PGUUID(as_uuid=True), ForeignKey("mcp_servers.id"))
     enabled = Column(Boolean, default=True)
-    custom_config = Column(JSON, default=dict)  # User-specific overrides
-    usage_count = Column(JSON, default=dict)  # Track usage statistics
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    custom_config = Column(JSONType, default=dict)  # User-specific overrides
+    usage_count = Column(JSONType, default=dict)  # Track usage statistics
+    created_at = Column(DateTime(timezone=True), server_default=utcnow(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=utcnow(), onupdate=utcnow(), nullable=False)
     
-    # Relationships
-    server = relationship("MCPServer", back_populates="user_configs")
-
-# Create tables
-Base.metadata.create_all(bind=engine)
+    __mapper_args__ = {"eager_defaults": True}
+    
+    # Relationships; never lazy-loaded (AsyncSession cannot), so queries that
+    # return it must request it with selectinload()
+    server = relationship("MCPServer", back_populates="user_configs", lazy="raise")
 
 # Pydantic Models
+# URLs are validated once on the way in and kept as plain strings, so they bind
+# straight to String columns and responses built from rows skip re-parsing them
+_HTTP_URL_ADAPTER = TypeAdapter(HttpUrl)
+
+def _validate_http_url(value: Any) -> str:
+    return str(_HTTP_URL_ADAPTER.validate_python(value))
+
+HttpUrlStr = Annotated[
+    str,
+    BeforeValidator(_validate_http_url),
+    WithJsonSchema({"type": "string", "format": "uri"})
+]
+
 class MCPServerBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=100)
     description: Optional[str] = None
-    url: HttpUrl
+    url: HttpUrlStr
     server_type: ServerType = ServerType.CUSTOM
     capabilities: Dict[str, Any] = Field(default_factory=dict)
     config: Dict[str, Any] = Field(default_factory=dict)
-    health_check_url: Optional[HttpUrl] = None
+    health_check_url: Optional[HttpUrlStr] = None
 
 class MCPServerCreate(MCPServerBase):
     pass
@@ -97,29 +184,33 @@ class MCPServerCreate(MCPServerBase):
 class MCPServerUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
-    url: Optional[HttpUrl] = None
+    url: Optional[HttpUrlStr] = None
     server_type: Optional[ServerType] = None
     status: Optional[ServerStatus] = None
     capabilities: Optional[Dict[str, Any]] = None
     config: Optional[Dict[str, Any]] = None
-    health_check_url: Optional[HttpUrl] = None
+    health_check_url: Optional[HttpUrlStr] = None
 
 class MCPServerResponse(MCPServerBase):
+    model_config = ConfigDict(from_attributes=True)
+
+    # Stored values were validated on write
+    url: str
+    health_check_url: Optional[str] = None
     id: UUID
     status: ServerStatus
     last_health_check: Optional[datetime]
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
-
 class UserServerConfigCreate(BaseModel):
     server_id: UUID
     enabled: bool = True
     custom_config: Dict[str, Any] = Field(default_factory=dict)
 
 class UserServerConfigResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: UUID
     user_id: str
     server_id: UUID
@@ -128,15 +219,48 @@ class UserServerConfigResponse(BaseModel):
     usage_count: Dict[str, Any]
     server: MCPServerResponse
 
-    class Config:
-        from_attributes = True
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Configure logging, create the shared health-probe HTTP client, start
+    health monitoring, and release everything plus the DB pool on shutdown.
+    
+    The schema is managed by Alembic; ``auto_create_schema`` opts into
+    ``create_all`` for local development.
+    """
+    # Here rather than in __main__ so `uvicorn mcp.mcp_registry_service:app`
+    # workers also pick up log_level and log_format
+    configure_logging()
+    if settings.auto_create_schema:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=100)
+    )
+    health_tasks = []
+    if settings.enable_health_monitoring:
+        results: asyncio.Queue = asyncio.Queue(maxsize=HEALTH_QUEUE_SIZE)
+        health_tasks = [
+            asyncio.create_task(health_loop(app.state.http, results)),
+            asyncio.create_task(health_writer(results))
+        ]
+    try:
+        yield
+    finally:
+        for task in health_tasks:
+            task.cancel()
+        await asyncio.gather(*health_tasks, return_exceptions=True)
+        await app.state.http.aclose()
+        await engine.dispose()
 
 # FastAPI App
 app = FastAPI(
     title=settings.app_name,
     description="Registry and router for managing multiple MCP servers",
     version=settings.app_version,
-    debug=settings.debug
+    debug=settings.debug,
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -149,12 +273,39 @@ app.add_middleware(
 )
 
 # Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+# Dependency to parse the {server_id} path segment once, straight from the raw string
+async def get_server_id(server_id: str = Path(..., description="MCP server UUID")) -> UUID:
+    try:
+        return UUID(server_id)
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Invalid server ID")
+
+# Serialized servers by id. Entries are dropped whenever this process writes
+# the row; other workers see changes within the TTL.
+server_cache: TTLCache = TTLCache(maxsize=1024, ttl=30)
+_server_cache_locks: Dict[UUID, asyncio.Lock] = {}
+
+async def get_server_cached(db: AsyncSession, server_id: UUID) -> Optional[MCPServerResponse]:
+    """Return a server from the cache, loading it at most once per miss."""
+    cached = server_cache.get(server_id)
+    if cached is not None:
+        return cached
+    
+    lock = _server_cache_locks.setdefault(server_id, asyncio.Lock())
+    async with lock:
+        cached = server_cache.get(server_id)
+        if cached is None:
+            server = await db.get(MCPServer, server_id)
+            if server is not None:
+                cached = MCPServerResponse.model_validate(server)
+                server_cache[server_id] = cached
+    if not lock.locked():
+        _server_cache_locks.pop(server_id, None)
+    return cached
 
 # Placeholder for user authentication
 def get_current_user(user_id: str = Query(..., description="User ID from auth system")):
@@ -173,81 +324,147 @@ async def health_check():
 @app.post("/servers", response_model=MCPServerResponse)
 async def create_server(
     server: MCPServerCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new MCP server entry in the registry."""
-    db_server = db.query(MCPServer).filter(MCPServer.name == server.name).first()
-    if db_server:
+    # One round-trip; the unique index on name rejects duplicates atomically
+    stmt = (
+        dialect_insert(MCPServer)
+        .values(**server.model_dump())
+        .on_conflict_do_nothing(index_elements=["name"])
+        .returning(MCPServer)
+    )
+    db_server = (await db.execute(stmt)).scalar_one_or_none()
+    if db_server is None:
         raise HTTPException(status_code=400, detail="Server with this name already exists")
     
-    db_server = MCPServer(**server.dict())
-    db.add(db_server)
-    db.commit()
-    db.refresh(db_server)
+    await db.commit()
     return db_server
 
 @app.get("/servers", response_model=List[MCPServerResponse])
 async def list_servers(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after_created_at: Optional[datetime] = None,
+    after: Optional[UUID] = None,
     server_type: Optional[ServerType] = None,
     status: Optional[ServerStatus] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """List all registered MCP servers with optional filtering."""
-    query = db.query(MCPServer)
+    """List all registered MCP servers with optional filtering, newest first.
+    
+    Pages are keyset-paginated on ``(created_at, id)``: pass the last row's
+    values as ``after_created_at`` / ``after``, or follow the ``Link: rel="next"``
+    header. ``skip`` (OFFSET) is kept for older clients but scans every
+    skipped row.
+    """
+    query = select(MCPServer).order_by(MCPServer.created_at.desc(), MCPServer.id.desc())
     
     if server_type:
-        query = query.filter(MCPServer.server_type == server_type)
+        query = query.where(MCPServer.server_type == server_type)
     if status:
-        query = query.filter(MCPServer.status == status)
+        query = query.where(MCPServer.status == status)
+    if after_created_at is not None and after is not None:
+        query = query.where(tuple_(MCPServer.created_at, MCPServer.id) < (after_created_at, after))
+    elif skip:
+        query = query.offset(skip)
     
-    servers = query.offset(skip).limit(limit).all()
+    servers = (await db.execute(query.limit(limit))).scalars().all()
+    
+    if servers and len(servers) == limit:
+        last = servers[-1]
+        next_url = request.url.remove_query_params("skip").include_query_params(
+            after_created_at=last.created_at.isoformat(),
+            after=str(last.id)
+        )
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
     return servers
 
+@app.get("/servers/stream")
+async def stream_servers(
+    server_type: Optional[ServerType] = None,
+    status: Optional[ServerStatus] = None
+):
+    """Stream every matching server as newline-delimited JSON, newest first.
+    
+    Rows are read through a server-side cursor in batches of 200, so memory
+    stays flat however large the registry grows.
+    """
+    query = select(MCPServer).order_by(MCPServer.created_at.desc(), MCPServer.id.desc())
+    
+    if server_type:
+        query = query.where(MCPServer.server_type == server_type)
+    if status:
+        query = query.where(MCPServer.status == status)
+    
+    async def generate():
+        # The session lives as long as the response body, not the handler
+        async with SessionLocal() as db:
+            result = await db.stream_scalars(query.execution_options(yield_per=200))
+            async for partition in result.partitions():
+                yield "".join(
+                    MCPServerResponse.model_validate(server).model_dump_json() + "\n"
+                    for server in partition
+                )
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
 @app.get("/servers/{server_id}", response_model=MCPServerResponse)
 async def get_server(
-    server_id: UUID,
-    db: Session = Depends(get_db)
+    server_id: UUID = Depends(get_server_id),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get details of a specific MCP server."""
-    server = db.query(MCPServer).filter(MCPServer.id == server_id).first()
+    server = await get_server_cached(db, server_id)
     if not server:
         raise HTTPException(status_code=404, detail="Server not found")
     return server
 
 @app.patch("/servers/{server_id}", response_model=MCPServerResponse)
 async def update_server(
-    server_id: UUID,
     server_update: MCPServerUpdate,
-    db: Session = Depends(get_db)
+    server_id: UUID = Depends(get_server_id),
+    db: AsyncSession = Depends(get_db)
 ):
-    """Update an MCP server configuration."""
-    server = db.query(MCPServer).filter(MCPServer.id == server_id).first()
+    """Update an MCP server configuration in a single UPDATE ... RETURNING.
+    
+    ``updated_at`` is set by the column's ``onupdate`` default.
+    """
+    update_data = server_update.model_dump(exclude_unset=True)
+    stmt = (
+        update(MCPServer)
+        .where(MCPServer.id == server_id)
+        .values(**update_data)
+        .returning(MCPServer)
+    )
+    server = (await db.execute(stmt)).scalar_one_or_none()
     if not server:
         raise HTTPException(status_code=404, detail="Server not found")
     
-    update_data = server_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(server, field, value)
-    
-    server.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(server)
+    await db.commit()
+    server_cache.pop(server_id, None)
+    health_state.pop(server_id, None)
     return server
 
 @app.delete("/servers/{server_id}")
 async def delete_server(
-    server_id: UUID,
-    db: Session = Depends(get_db)
+    server_id: UUID = Depends(get_server_id),
+    db: AsyncSession = Depends(get_db)
 ):
-    """Remove an MCP server from the registry."""
-    server = db.query(MCPServer).filter(MCPServer.id == server_id).first()
-    if not server:
+    """Remove an MCP server and its user configurations from the registry."""
+    # Children first so the foreign key is never violated; a 404 rolls both back
+    await db.execute(delete(UserServerConfig).where(UserServerConfig.server_id == server_id))
+    deleted = (
+        await db.execute(delete(MCPServer).where(MCPServer.id == server_id).returning(MCPServer.id))
+    ).scalar_one_or_none()
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Server not found")
     
-    db.delete(server)
-    db.commit()
+    await db.commit()
+    server_cache.pop(server_id, None)
+    health_state.pop(server_id, None)
     return {"message": "Server deleted successfully"}
 
 # User-specific server configurations
@@ -255,73 +472,196 @@ async def delete_server(
 async def configure_user_server(
     config: UserServerConfigCreate,
     user_id: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """Configure a server for a specific user."""
-    # Check if server exists
-    server = db.query(MCPServer).filter(MCPServer.id == config.server_id).first()
+    """Configure a server for a specific user (created or updated in one statement)."""
+    # Check if server exists; it is also embedded in the response
+    server = await db.get(MCPServer, config.server_id)
     if not server:
         raise HTTPException(status_code=404, detail="Server not found")
     
-    # Check if config already exists
-    existing = db.query(UserServerConfig).filter(
-        UserServerConfig.user_id == user_id,
-        UserServerConfig.server_id == config.server_id
-    ).first()
-    
-    if existing:
-        # Update existing config
-        existing.enabled = config.enabled
-        existing.custom_config = config.custom_config
-        existing.updated_at = datetime.utcnow()
-        db.commit()
-        db.refresh(existing)
-        return existing
-    
-    # Create new config
-    db_config = UserServerConfig(
-        user_id=user_id,
-        **config.dict()
+    stmt = dialect_insert(UserServerConfig).values(user_id=user_id, **config.model_dump())
+    stmt = (
+        stmt.on_conflict_do_update(
+            index_elements=["user_id", "server_id"],
+            set_={
+                "enabled": stmt.excluded.enabled,
+                "custom_config": stmt.excluded.custom_config,
+                "updated_at": utcnow()
+            }
+        )
+        .returning(UserServerConfig)
     )
-    db.add(db_config)
-    db.commit()
-    db.refresh(db_config)
+    db_config = (await db.execute(stmt)).scalar_one()
+    # Attach the server loaded above rather than querying it again
+    set_committed_value(db_config, "server", server)
+    await db.commit()
     return db_config
 
 @app.get("/users/servers", response_model=List[UserServerConfigResponse])
 async def list_user_servers(
     user_id: str = Depends(get_current_user),
     enabled_only: bool = True,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """List all servers configured for a specific user."""
-    query = db.query(UserServerConfig).filter(UserServerConfig.user_id == user_id)
+    # One extra IN query loads every row's server instead of one query per row
+    query = (
+        select(UserServerConfig)
+        .where(UserServerConfig.user_id == user_id)
+        .options(selectinload(UserServerConfig.server))
+    )
     
     if enabled_only:
-        query = query.filter(UserServerConfig.enabled == True)
+        query = query.where(UserServerConfig.enabled == True)
     
-    configs = query.all()
+    configs = (await db.execute(query)).scalars().all()
     return configs
 
+async def _probe_server(client: httpx.AsyncClient, server: MCPServer) -> ServerStatus:
+    """Probe a server's health endpoint; anything but a 5xx counts as active."""
+    url = server.health_check_url or f"{server.url.rstrip('/')}/health"
+    try:
+        response = await client.get(url, timeout=2.0)
+    except httpx.HTTPError:
+        return ServerStatus.ERROR
+    return ServerStatus.ACTIVE if response.status_code < 500 else ServerStatus.ERROR
+
+# Background health monitoring: health_loop probes servers every
+# settings.health_check_interval seconds and hands results to health_writer
+# through a bounded queue; the writer coalesces them into one UPDATE per flush.
+# Only the worker holding settings.health_monitor_lock_file sweeps, so a
+# multi-worker deployment probes each server once per interval. Separate hosts
+# or containers do not share the lock; enable monitoring on one of them only.
+HEALTH_QUEUE_SIZE = 1000
+HEALTH_PROBE_CONCURRENCY = 50
+HEALTH_FLUSH_INTERVAL = 2.0  # seconds
+_HEALTH_MONITORED = [ServerStatus.ACTIVE, ServerStatus.ERROR]
+
+# Latest probe outcome by server id, as seen by this worker's monitor
+health_state: Dict[UUID, Dict[str, Any]] = {}
+
+def _try_health_lock(path: str) -> Optional[IO]:
+    """Take the monitor lock without blocking; the open handle keeps it held.
+    
+    Without ``fcntl`` (e.g. on Windows) every worker monitors.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        return open(path, "a")
+    handle = open(path, "a")
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return None
+    return handle
+
+async def health_loop(client: httpx.AsyncClient, results: asyncio.Queue):
+    """Probe every monitored server concurrently, once per interval.
+    
+    Workers that do not hold the monitor lock retry it every interval, so
+    another worker takes over if the current one exits.
+    """
+    semaphore = asyncio.Semaphore(HEALTH_PROBE_CONCURRENCY)
+    lock = None
+    
+    async def probe(server: MCPServer):
+        async with semaphore:
+            status = await _probe_server(client, server)
+        state = {
+            "server_id": server.id,
+            "name": server.name,
+            "status": status,
+            "last_check": datetime.now(timezone.utc)
+        }
+        health_state[server.id] = state
+        # Blocks while the writer is behind, bounding pending writes
+        await results.put(state)
+    
+    try:
+        while True:
+            if lock is None:
+                lock = _try_health_lock(settings.health_monitor_lock_file)
+            if lock is not None:
+                try:
+                    async with SessionLocal() as db:
+                        servers = (
+                            await db.execute(
+                                select(MCPServer).where(MCPServer.status.in_(_HEALTH_MONITORED))
+                            )
+                        ).scalars().all()
+                    monitored = {server.id for server in servers}
+                    for server_id in health_state.keys() - monitored:
+                        del health_state[server_id]
+                    await asyncio.gather(*[probe(server) for server in servers])
+                except Exception:
+                    logger.exception("Health check sweep failed")
+            await asyncio.sleep(settings.health_check_interval)
+    finally:
+        if lock is not None:
+            lock.close()
+
+async def health_writer(results: asyncio.Queue):
+    """Write queued probe results back in one bulk UPDATE per flush interval."""
+    while True:
+        pending = {}
+        state = await results.get()
+        pending[state["server_id"]] = state
+        await asyncio.sleep(HEALTH_FLUSH_INTERVAL)
+        while not results.empty():
+            state = results.get_nowait()
+            pending[state["server_id"]] = state
+        
+        try:
+            async with SessionLocal() as db:
+                # Skip rows an admin moved out of monitoring since the probe, and
+                # keep updated_at for configuration changes
+                await db.execute(
+                    update(MCPServer)
+                    .where(MCPServer.id.in_(pending), MCPServer.status.in_(_HEALTH_MONITORED))
+                    .values(
+                        updated_at=MCPServer.updated_at,
+                        status=case(
+                            {server_id: state["status"].value for server_id, state in pending.items()},
+                            value=MCPServer.id
+                        ),
+                        last_health_check=case(
+                            {server_id: state["last_check"] for server_id, state in pending.items()},
+                            value=MCPServer.id
+                        )
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                await db.commit()
+        except Exception:
+            logger.exception("Failed to write %d health check results", len(pending))
+        for server_id in pending:
+            server_cache.pop(server_id, None)
+
 # Server health monitoring endpoint
 @app.post("/servers/{server_id}/health-check")
 async def check_server_health(
-    server_id: UUID,
-    db: Session = Depends(get_db)
+    server_id: UUID = Depends(get_server_id),
+    db: AsyncSession = Depends(get_db)
 ):
-    """Perform a health check on a specific MCP server."""
-    server = db.query(MCPServer).filter(MCPServer.id == server_id).first()
-    if not server:
-        raise HTTPException(status_code=404, detail="Server not found")
-    
-    # TODO: Implement actual health check logic
-    # This would involve making HTTP requests to the server's health endpoint
-    # For now, we'll just update the timestamp
+    """Return a server's latest health check result.
     
-    server.last_health_check = datetime.utcnow()
-    server.status = ServerStatus.ACTIVE  # This would be determined by actual check
-    db.commit()
+    Checks run in the background; this reports the most recent probe seen by
+    this worker's monitor, or the stored status otherwise.
+    """
+    state = health_state.get(server_id)
+    if state is not None:
+        return {
+            "server_id": server_id,
+            "status": state["status"],
+            "last_check": state["last_check"]
+        }
     
+    server = await get_server_cached(db, server_id)
+    if not server:
+        raise HTTPException(status_code=404, detail="Server not found")
     return {
         "server_id": server_id,
         "status": server.status,
@@ -330,25 +670,27 @@ async def check_server_health(
 
 # Batch operations for efficiency
 @app.post("/servers/batch-health-check")
-async def batch_health_check(
-    db: Session = Depends(get_db)
-):
-    """Perform health checks on all active servers."""
-    active_servers = db.query(MCPServer).filter(
-        MCPServer.status.in_([ServerStatus.ACTIVE, ServerStatus.ERROR])
-    ).all()
+async def batch_health_check(db: AsyncSession = Depends(get_db)):
+    """Return the latest health check result for every monitored server.
     
-    results = []
-    for server in active_servers:
-        # TODO: Implement parallel health checks
-        server.last_health_check = datetime.utcnow()
-        results.append({
-            "server_id": server.id,
-            "name": server.name,
-            "status": server.status
-        })
-    
-    db.commit()
+    Results come from the background monitor (stored rows, refreshed by this
+    worker's own probes when it is the one monitoring), so this never waits
+    on a probe.
+    """
+    rows = (
+        await db.execute(
+            select(MCPServer.id, MCPServer.name, MCPServer.status)
+            .where(MCPServer.status.in_(_HEALTH_MONITORED))
+        )
+    ).all()
+    results = [
+        {
+            "server_id": server_id,
+            "name": name,
+            "status": health_state.get(server_id, {}).get("status", status)
+        }
+        for server_id, name, status in rows
+    ]
     return {"checked": len(results), "results": results}
 
 if __name__ == "__main__":
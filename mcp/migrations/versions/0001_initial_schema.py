@@ -0,0 +1,136 @@
+"""Initial MCP registry schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-15
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+JSONType = sa.JSON().with_variant(postgresql.JSONB(), "postgresql")
+HEALTH_CHECKED_STATUSES = sa.text("status IN ('active', 'error')")
+
+
+# (name, columns, options) per table; indexes a database lacks are added
+INDEXES = {
+    "mcp_servers": [
+        ("ix_mcp_servers_name", ["name"], {"unique": True}),
+        ("ix_mcp_type_status", ["server_type", "status"], {}),
+        ("ix_mcp_created_id", ["created_at", "id"], {}),
+        (
+            "ix_mcp_active",
+            ["status"],
+            {
+                "postgresql_where": HEALTH_CHECKED_STATUSES,
+                "sqlite_where": HEALTH_CHECKED_STATUSES,
+            },
+        ),
+    ],
+    "user_server_configs": [
+        ("ix_usc_user_enabled", ["user_id", "enabled"], {}),
+    ],
+}
+# Made by create_all for index=True on user_id; ix_usc_user_enabled covers it
+LEGACY_INDEXES = {"user_server_configs": ["ix_user_server_configs_user_id"]}
+JSON_COLUMNS = {
+    "mcp_servers": ["capabilities", "config"],
+    "user_server_configs": ["custom_config", "usage_count"],
+}
+USER_SERVER_UNIQUE = "uq_user_server_configs_user_server"
+
+
+def upgrade() -> None:
+    # Databases created by the service's former import-time create_all have
+    # these tables but no alembic_version row; adopt them instead of failing
+    # with "table already exists", adding only what that schema lacks
+    # Offline (--sql) runs have no database to inspect; emit the fresh schema
+    offline = op.get_context().as_sql
+    inspector = None if offline else sa.inspect(op.get_bind())
+    existing = set() if offline else set(inspector.get_table_names())
+
+    if "mcp_servers" not in existing:
+        op.create_table(
+            "mcp_servers",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("description", sa.String()),
+            sa.Column("url", sa.String(), nullable=False),
+            sa.Column("server_type", sa.String()),
+            sa.Column("status", sa.String()),
+            sa.Column("capabilities", JSONType),
+            sa.Column("config", JSONType),
+            sa.Column("health_check_url", sa.String()),
+            sa.Column("last_health_check", sa.DateTime()),
+            sa.Column("created_at", sa.DateTime()),
+            sa.Column("updated_at", sa.DateTime()),
+        )
+
+    if "user_server_configs" not in existing:
+        op.create_table(
+            "user_server_configs",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column("user_id", sa.String(), nullable=False),
+            sa.Column("server_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("mcp_servers.id")),
+            sa.Column("enabled", sa.Boolean()),
+            sa.Column("custom_config", JSONType),
+            sa.Column("usage_count", JSONType),
+            sa.Column("created_at", sa.DateTime()),
+            sa.Column("updated_at", sa.DateTime()),
+            sa.UniqueConstraint("user_id", "server_id", name=USER_SERVER_UNIQUE),
+        )
+    elif USER_SERVER_UNIQUE not in {
+        c["name"] for c in inspector.get_unique_constraints("user_server_configs")
+    }:
+        # SQLite reflects UUID columns as NUMERIC; keep their type when batch
+        # mode rebuilds the table
+        with op.batch_alter_table(
+            "user_server_configs",
+            reflect_args=[
+                sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+                sa.Column("server_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("mcp_servers.id")),
+            ],
+        ) as batch_op:
+            batch_op.create_unique_constraint(USER_SERVER_UNIQUE, ["user_id", "server_id"])
+
+    for table, indexes in INDEXES.items():
+        present = set()
+        if table in existing:
+            present = {i["name"] for i in inspector.get_indexes(table)}
+        for name, columns, options in indexes:
+            if name not in present:
+                op.create_index(name, table, columns, **options)
+        for name in LEGACY_INDEXES.get(table, []):
+            if name in present:
+                op.drop_index(name, table_name=table)
+
+    # create_all made plain JSON columns on PostgreSQL
+    if op.get_context().dialect.name == "postgresql":
+        for table, columns in JSON_COLUMNS.items():
+            if table not in existing:
+                continue
+            types = {c["name"]: c["type"] for c in inspector.get_columns(table)}
+            for column in columns:
+                if not isinstance(types[column], postgresql.JSONB):
+                    op.alter_column(
+                        table,
+                        column,
+                        type_=postgresql.JSONB(),
+                        postgresql_using=f"{column}::jsonb",
+                    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_usc_user_enabled", table_name="user_server_configs")
+    op.drop_table("user_server_configs")
+    op.drop_index("ix_mcp_active", table_name="mcp_servers")
+    op.drop_index("ix_mcp_created_id", table_name="mcp_servers")
+    op.drop_index("ix_mcp_type_status", table_name="mcp_servers")
+    op.drop_index("ix_mcp_servers_name", table_name="mcp_servers")
+    op.drop_table("mcp_servers")
@@ -0,0 +1,79 @@
+"""Database-stamped, timezone-aware timestamps
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# Existing values were written with datetime.utcnow()
+TIMESTAMP_COLUMNS = {
+    "mcp_servers": ["last_health_check", "created_at", "updated_at"],
+    "user_server_configs": ["created_at", "updated_at"],
+}
+
+# SQLite reflects UUID columns as NUMERIC; keep their type when batch mode
+# rebuilds the table
+UUID_COLUMNS = {
+    "mcp_servers": lambda: [
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+    ],
+    "user_server_configs": lambda: [
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("server_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("mcp_servers.id")),
+    ],
+}
+
+
+def _batch(table: str):
+    return op.batch_alter_table(table, reflect_args=UUID_COLUMNS[table]())
+
+
+def _now_sql() -> str:
+    # Same expression as utcnow() in the service: SQLite's CURRENT_TIMESTAMP
+    # drops fractional seconds, which breaks keyset cursors on created_at
+    if op.get_context().dialect.name == "sqlite":
+        return "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+    return "now()"
+
+
+def upgrade() -> None:
+    now = _now_sql()
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        for column in ("created_at", "updated_at"):
+            op.execute(
+                sa.text(f"UPDATE {table} SET {column} = {now} WHERE {column} IS NULL")
+            )
+        with _batch(table) as batch_op:
+            for column in columns:
+                stamped = column != "last_health_check"
+                batch_op.alter_column(
+                    column,
+                    existing_type=sa.DateTime(),
+                    type_=sa.DateTime(timezone=True),
+                    server_default=sa.text(f"({now})") if stamped else None,
+                    nullable=not stamped,
+                    postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+                )
+
+
+def downgrade() -> None:
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        with _batch(table) as batch_op:
+            for column in columns:
+                batch_op.alter_column(
+                    column,
+                    existing_type=sa.DateTime(timezone=True),
+                    type_=sa.DateTime(),
+                    server_default=None,
+                    nullable=True,
+                    postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+                )
@@ -7,6 +7,7 @@ with the MCP registry and used by MCP clients.
 """
 
 import asyncio
+import functools
 import random
 from typing import Dict, Any, List
 from datetime import datetime
@@ -23,6 +24,33 @@ MOCK_WEATHER_DATA = {
     "Paris": {"temp": 63, "condition": "Cloudy", "humidity": 75},
 }
 
+# The all-cities snapshot never changes; only its timestamp does
+ALL_CITIES_WEATHER = {
+    city: {
+        "temperature": weather["temp"],
+        "condition": weather["condition"],
+        "humidity": weather["humidity"],
+        "unit": "fahrenheit"
+    }
+    for city, weather in MOCK_WEATHER_DATA.items()
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _known_city_payload(city: str) -> Dict[str, Any]:
+    """Build the static part of a current-weather response for a known city.
+
+    The returned dict is shared between calls and must not be mutated.
+    """
+    weather = MOCK_WEATHER_DATA[city]
+    return {
+        "city": city,
+        "temperature": weather["temp"],
+        "condition": weather["condition"],
+        "humidity": weather["humidity"],
+        "unit": "fahrenheit"
+    }
+
 # Create FastMCP server instance
 mcp = FastMCP(
     name="Weather Server",
@@ -44,21 +72,18 @@ async def get_current_weather(city: str) -> Dict[str, Any]:
     # Simulate API delay
     await asyncio.sleep(0.5)
     
-    # Get mock data or generate random
+    # Known cities reuse a precomputed payload; others get random data
     if city in MOCK_WEATHER_DATA:
-        weather = MOCK_WEATHER_DATA[city]
-    else:
-        weather = {
-            "temp": random.randint(50, 85),
-            "condition": random.choice(["Sunny", "Cloudy", "Rainy", "Clear"]),
-            "humidity": random.randint(40, 90)
+        return {
+            **_known_city_payload(city),
+            "timestamp": datetime.utcnow().isoformat()
         }
     
     return {
         "city": city,
-        "temperature": weather["temp"],
-        "condition": weather["condition"],
-        "humidity": weather["humidity"],
+        "temperature": random.randint(50, 85),
+        "condition": random.choice(["Sunny", "Cloudy", "Rainy", "Clear"]),
+        "humidity": random.randint(40, 90),
         "unit": "fahrenheit",
         "timestamp": datetime.utcnow().isoformat()
     }
@@ -121,24 +146,23 @@ async def compare_weather(cities: List[str], ctx: Context) -> Dict[str, Any]:
     # Report initial progress
     await ctx.info(f"Comparing weather for {len(cities)} cities...")
     
-    # Get weather for each city
-    comparison = {}
-    for i, city in enumerate(cities):
-        # Report progress
-        await ctx.report_progress(i, len(cities))
-        
+    async def _fetch(city: str):
         # Simulate API delay
         await asyncio.sleep(0.3)
         
         if city in MOCK_WEATHER_DATA:
-            weather = MOCK_WEATHER_DATA[city]
-        else:
-            weather = {
-                "temp": random.randint(50, 85),
-                "condition": random.choice(["Sunny", "Cloudy", "Rainy", "Clear"]),
-                "humidity": random.randint(40, 90)
-            }
-        
+            return city, MOCK_WEATHER_DATA[city]
+        return city, {
+            "temp": random.randint(50, 85),
+            "condition": random.choice(["Sunny", "Cloudy", "Rainy", "Clear"]),
+            "humidity": random.randint(40, 90)
+        }
+    
+    # Look up all cities concurrently
+    results = await asyncio.gather(*[_fetch(city) for city in cities])
+    
+    comparison = {}
+    for city, weather in results:
         comparison[city] = {
             "temperature": weather["temp"],
             "condition": weather["condition"],
@@ -172,19 +196,10 @@ async def get_all_cities_weather() -> Dict[str, Any]:
     This resource provides a snapshot of weather data for all cities
     we have information about.
     """
-    all_weather = {}
-    for city, weather in MOCK_WEATHER_DATA.items():
-        all_weather[city] = {
-            "temperature": weather["temp"],
-            "condition": weather["condition"],
-            "humidity": weather["humidity"],
-            "unit": "fahrenheit"
-        }
-    
     return {
-        "cities": all_weather,
+        "cities": ALL_CITIES_WEATHER,
         "timestamp": datetime.utcnow().isoformat(),
-        "total_cities": len(all_weather)
+        "total_cities": len(ALL_CITIES_WEATHER)
     }
 
 
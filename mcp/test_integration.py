@@ -14,114 +14,114 @@ import httpx
 from fastmcp import Client
 
 
-async def test_registry_integration():
-    """Test the complete MCP registry integration flow."""
+REGISTRY_URL = "http://localhost:8000"
+
+
+async def run_registry_integration(http_client: httpx.AsyncClient):
+    """Test the complete MCP registry integration flow.
     
-    registry_url = "http://localhost:8000"
+    All registry requests share ``http_client`` so its pooled connections
+    are reused from step to step.
+    """
     
     # Step 1: Register an MCP server with the registry
     print("1. Registering MCP server with registry...")
     
-    async with httpx.AsyncClient() as http_client:
-        # Register our example weather server
-        server_data = {
-            "name": "Weather MCP Server",
-            "description": "Provides weather information and forecasts",
-            "url": "http://localhost:8001/sse",  # SSE transport
-            "server_type": "tools",
-            "capabilities": {
-                "tools": [
-                    {
-                        "name": "get_current_weather",
-                        "description": "Get current weather for a city"
-                    },
-                    {
-                        "name": "get_weather_forecast", 
-                        "description": "Get weather forecast"
-                    },
-                    {
-                        "name": "compare_weather",
-                        "description": "Compare weather between cities"
-                    }
-                ]
-            },
-            "health_check_url": "http://localhost:8001/health"
-        }
-        
-        response = await http_client.post(
-            f"{registry_url}/servers",
-            json=server_data
-        )
-        
-        if response.status_code == 200:
-            server_info = response.json()
-            server_id = server_info["id"]
-            print(f"✓ Server registered with ID: {server_id}")
-        else:
-            print(f"✗ Failed to register server: {response.text}")
-            return
+    # Register our example weather server
+    server_data = {
+        "name": "Weather MCP Server",
+        "description": "Provides weather information and forecasts",
+        "url": "http://localhost:8001/sse",  # SSE transport
+        "server_type": "tools",
+        "capabilities": {
+            "tools": [
+                {
+                    "name": "get_current_weather",
+                    "description": "Get current weather for a city"
+                },
+                {
+                    "name": "get_weather_forecast", 
+                    "description": "Get weather forecast"
+                },
+                {
+                    "name": "compare_weather",
+                    "description": "Compare weather between cities"
+                }
+            ]
+        },
+        "health_check_url": "http://localhost:8001/health"
+    }
+    
+    response = await http_client.post(
+        "/servers",
+        json=server_data
+    )
+    
+    if response.status_code == 200:
+        server_info = response.json()
+        server_id = server_info["id"]
+        print(f"✓ Server registered with ID: {server_id}")
+    else:
+        print(f"✗ Failed to register server: {response.text}")
+        return
     
     # Step 2: Configure user access to the server
     print("\n2. Configuring user access...")
     
     user_id = "test-user-123"
     
-    async with httpx.AsyncClient() as http_client:
-        response = await http_client.post(
-            f"{registry_url}/users/servers?user_id={user_id}",
-            json={
-                "server_id": server_id,
-                "enabled": True,
-                "custom_config": {}
-            }
-        )
-        
-        if response.status_code == 200:
-            print(f"✓ User {user_id} configured for server access")
-        else:
-            print(f"✗ Failed to configure user: {response.text}")
+    response = await http_client.post(
+        f"/users/servers?user_id={user_id}",
+        json={
+            "server_id": server_id,
+            "enabled": True,
+            "custom_config": {}
+        }
+    )
+    
+    if response.status_code == 200:
+        print(f"✓ User {user_id} configured for server access")
+    else:
+        print(f"✗ Failed to configure user: {response.text}")
     
     # Step 3: Use the MCP integration endpoints to discover and call tools
     print("\n3. Testing MCP integration endpoints...")
     
     # Initialize user session
-    async with httpx.AsyncClient() as http_client:
-        response = await http_client.post(
-            f"{registry_url}/mcp/initialize",
-            params={"user_id": user_id}
-        )
-        print(f"✓ User session initialized")
+    response = await http_client.post(
+        "/mcp/initialize",
+        params={"user_id": user_id}
+    )
+    print(f"✓ User session initialized")
     
     # Discover available tools
-    async with httpx.AsyncClient() as http_client:
-        response = await http_client.get(
-            f"{registry_url}/mcp/discover",
-            params={"user_id": user_id}
-        )
-        
-        if response.status_code == 200:
-            tools_data = response.json()
-            print(f"✓ Discovered {tools_data['total_tools']} tools")
-            print(f"  Servers: {list(tools_data['servers'].keys())}")
+    response = await http_client.get(
+        "/mcp/discover",
+        params={"user_id": user_id}
+    )
+    
+    if response.status_code == 200:
+        tools_data = response.json()
+        print(f"✓ Discovered {tools_data['total_tools']} tools")
+        print(f"  Servers: {list(tools_data['servers'].keys())}")
     
     # Call a tool through the registry
-    async with httpx.AsyncClient() as http_client:
-        response = await http_client.post(
-            f"{registry_url}/mcp/call",
-            params={"user_id": user_id},
-            json={
-                "server_id": server_id,
-                "tool_name": "get_current_weather",
-                "parameters": {"city": "New York"}
-            }
-        )
-        
-        if response.status_code == 200:
-            result = response.json()
-            print(f"✓ Tool call successful:")
-            print(f"  Result: {json.dumps(result['result'], indent=2)}")
-        else:
-            print(f"✗ Tool call failed: {response.text}")
+    response = await http_client.post(
+        "/mcp/call",
+        params={"user_id": user_id},
+        json={
+            "server_id": server_id,
+            "tool_name": "get_current_weather",
+            "parameters": {"city": "New York"}
+        }
+    )
+    
+    if response.status_code == 200:
+        result = response.json()
+        print(f"✓ Tool call successful:")
+        print(f"  Result: {json.dumps(result['result'], indent=2)}")
+    else:
+        print(f"✗ Tool call failed: {response.text}")
     
     # Step 4: Direct MCP client connection (bypassing registry)
     print("\n4. Testing direct MCP client connection...")
@@ -153,31 +153,54 @@ async def test_registry_integration():
     # Step 5: Test batch operations
     print("\n5. Testing batch tool calls...")
     
-    async with httpx.AsyncClient() as http_client:
-        response = await http_client.post(
-            f"{registry_url}/mcp/batch-call",
-            params={"user_id": user_id},
-            json={
-                "calls": [
-                    {
-                        "server_id": server_id,
-                        "tool_name": "get_current_weather",
-                        "parameters": {"city": "Paris"}
-                    },
-                    {
-                        "server_id": server_id,
-                        "tool_name": "get_current_weather",
-                        "parameters": {"city": "Tokyo"}
-                    }
-                ]
-            }
+    response = await http_client.post(
+        "/mcp/batch-call",
+        params={"user_id": user_id},
+        json={
+            "calls": [
+                {
+                    "server_id": server_id,
+                    "tool_name": "get_current_weather",
+                    "parameters": {"city": "Paris"}
+                },
+                {
+                    "server_id": server_id,
+                    "tool_name": "get_current_weather",
+                    "parameters": {"city": "Tokyo"}
+                }
+            ]
+        }
+    )
+    
+    if response.status_code == 200:
+        results = response.json()
+        print(f"✓ Batch call successful: {len(results)} results")
+    else:
+        print(f"✗ Batch call failed: {response.text}")
+    
+    # Step 6: Walk the keyset-paginated server list
+    print("\n6. Testing paginated server listing...")
+    
+    # Register a few more servers in quick succession so pages share timestamps
+    for i in range(5):
+        await http_client.post(
+            "/servers",
+            json={"name": f"Pagination Server {uuid4().hex[:8]} {i}", "url": "http://localhost:8001/sse"}
         )
-        
-        if response.status_code == 200:
-            results = response.json()
-            print(f"✓ Batch call successful: {len(results)} results")
-        else:
-            print(f"✗ Batch call failed: {response.text}")
+    
+    seen_ids = []
+    pages = 0
+    next_url = "/servers?limit=2"
+    while next_url and pages < 100:
+        response = await http_client.get(next_url)
+        seen_ids += [server["id"] for server in response.json()]
+        pages += 1
+        next_url = response.links.get("next", {}).get("url")
+    
+    if pages > 1 and len(seen_ids) == len(set(seen_ids)) and not next_url:
+        print(f"✓ Walked {pages} pages, {len(seen_ids)} unique servers")
+    else:
+        print(f"✗ Pagination repeated servers: {len(set(seen_ids))} unique of {len(seen_ids)} over {pages} pages")
 
 
 async def run_weather_server():
@@ -213,13 +236,21 @@ async def main():
     # Start the weather server
     weather_process = await run_weather_server()
     
+    # One client for the whole run, so connections are reused between steps
+    http_client = httpx.AsyncClient(
+        base_url=REGISTRY_URL,
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=20)
+    )
+    
     try:
         # Run the integration test
-        await test_registry_integration()
+        await run_registry_integration(http_client)
         
     finally:
         # Clean up
         print("\nCleaning up...")
+        await http_client.aclose()
         weather_process.terminate()
         weather_process.wait()
     